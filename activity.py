@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pygame
+
+
+ACTIVE = "active"
+IDLE = "idle"
+SLEEPING = "sleeping"
+
+
+class ActivityTiers:
+    """Decides which monsters Monster.update() runs for on each tick (AI level of detail).
+
+    - active: on screen, within its aggro radius of the player, or busy (dying,
+      knocked back, hit flash); updated every tick.
+    - idle: off screen but within the wake radius (largest aggro radius plus
+      WAKE_MARGIN_TILES); updated IDLE_HZ times per second with the skipped time
+      added up, so animations and timers keep their pace.
+    - sleeping: everything else; not looked at at all. Sleeping monsters are
+      found again through the spatial hash when the player or the screen gets near.
+    """
+
+    IDLE_HZ = 5
+    WAKE_MARGIN_TILES = 4
+
+    def __init__(self, tile_size: int):
+        self.tile_size = tile_size
+        self.wake_px = 0
+        self.aggro_px = 0
+        # Monsters that were active or idle on the last tick -> seconds not yet passed to update().
+        self._awake: dict[object, float] = {}
+        self._stagger = 0
+        self.counts = {ACTIVE: 0, IDLE: 0, SLEEPING: 0}
+
+    def reset(self, monsters):
+        self._awake.clear()
+        self.aggro_px = max((m.aggro_radius_px for m in monsters), default=0)
+        self.wake_px = self.aggro_px + self.WAKE_MARGIN_TILES * self.tile_size
+        self.counts = {ACTIVE: 0, IDLE: 0, SLEEPING: len(monsters)}
+
+    def remove(self, monster):
+        self._awake.pop(monster, None)
+
+    def select(self, dt: float, monster_hash, total: int, player_rect: pygame.Rect, view: pygame.Rect):
+        """[(monster, dt to update it with), ...] for this tick, in spawn order.
+
+        `total` is the number of monsters on the map (for the sleeping count).
+        """
+        center = player_rect.center
+        awake = self._awake
+        candidates = set(monster_hash.query_radius(center, self.wake_px))
+        candidates.update(monster_hash.query_rect(view))
+        candidates.update(awake)
+
+        idle_interval = 1.0 / self.IDLE_HZ
+        px, py = center
+        selected = []
+        active = idle = 0
+        for m in monster_hash.in_order(candidates):
+            dx = m.rect.centerx - px
+            dy = m.rect.centery - py
+            dist_sq = dx * dx + dy * dy
+            if m.is_busy() or view.colliderect(m.rect) or dist_sq <= m.aggro_radius_px**2:
+                active += 1
+                awake[m] = 0.0
+                selected.append((m, dt))
+            elif dist_sq <= self.wake_px**2 or m in awake:
+                idle += 1
+                if m not in awake:
+                    # Spread newly idle monsters over the interval so they don't all tick together.
+                    self._stagger = (self._stagger + 1) % 12
+                    awake[m] = idle_interval * self._stagger / 12
+                pending = awake[m] + dt
+                if pending >= idle_interval:
+                    selected.append((m, pending))
+                    pending = 0.0
+                awake[m] = pending
+                if dist_sq > self.wake_px**2:
+                    # Left the wake radius: this was its last tick until it's woken again.
+                    del awake[m]
+        self.counts = {ACTIVE: active, IDLE: idle, SLEEPING: total - active - idle}
+        return selected
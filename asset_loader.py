@@ -0,0 +1,100 @@
+"""Parallel asset preloading.
+
+PNG and WAV files are read and decoded on a thread pool (file I/O and SDL's
+decoders release the GIL). Only the display-dependent part of image loading
+(convert_alpha + scaling, see assets.finish_image) runs on the main thread, as
+each decode completes. Decoded images land in assets.image_cache, so the normal
+load_image calls made by TileSet, ObjectRegistry, Player and Monster afterwards
+are cache hits.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pygame
+
+from assets import finish_image, is_image_ready
+
+
+def _decode_image(path: Path):
+    t0 = time.perf_counter()
+    try:
+        raw = pygame.image.load(str(path))
+    except Exception:
+        raw = None
+    return raw, time.perf_counter() - t0
+
+
+def _decode_sound(path: Path):
+    t0 = time.perf_counter()
+    try:
+        sound = pygame.mixer.Sound(path)
+    except Exception:
+        sound = None
+    return sound, time.perf_counter() - t0
+
+
+class AssetLoader:
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 1)
+        self._images: dict[tuple[Path, int], None] = {}
+        self._sounds: dict[Path, None] = {}
+
+        # One entry per loaded asset: {"path", "kind", "decode_ms", "finish_ms"}.
+        self.timings: list[dict] = []
+        self.total_ms = 0.0
+
+    def add_image(self, path: Path, scale: int = 1):
+        # Images that are already cached (or served by the asset pack / atlas) are skipped.
+        if not is_image_ready(path, scale):
+            self._images[(path, scale)] = None
+
+    def add_images(self, paths, scale: int = 1):
+        for path in paths:
+            self.add_image(path, scale)
+
+    def add_sound(self, path: Path):
+        self._sounds[path] = None
+
+    def run(self):
+        """Load everything queued. Returns {path: Sound or None} for the queued sounds."""
+        sounds: dict[Path, pygame.mixer.Sound | None] = {}
+        t0 = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for path, scale in self._images:
+                futures[pool.submit(_decode_image, path)] = ("image", path, scale)
+            for path in self._sounds:
+                futures[pool.submit(_decode_sound, path)] = ("sound", path, None)
+
+            for future in as_completed(futures):
+                kind, path, scale = futures[future]
+                result, decode_s = future.result()
+
+                t1 = time.perf_counter()
+                if kind == "image":
+                    finish_image(result, path, scale=scale)
+                else:
+                    sounds[path] = result
+                finish_s = time.perf_counter() - t1
+
+                self.timings.append(
+                    {"path": path, "kind": kind, "decode_ms": decode_s * 1000.0, "finish_ms": finish_s * 1000.0}
+                )
+
+        self.total_ms = (time.perf_counter() - t0) * 1000.0
+        self._images.clear()
+        self._sounds.clear()
+        return sounds
+
+    def report(self):
+        """Human-readable per-asset timings, slowest first."""
+        lines = [f"Loaded {len(self.timings)} assets in {self.total_ms:.1f} ms ({self.max_workers} workers)"]
+        for t in sorted(self.timings, key=lambda t: t["decode_ms"] + t["finish_ms"], reverse=True):
+            lines.append(f"  {t['kind']:5} {t['decode_ms']:7.2f} ms decode {t['finish_ms']:7.2f} ms finish  {t['path']}")
+        return "\n".join(lines)
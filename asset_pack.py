@@ -0,0 +1,193 @@
+"""Pre-scaled raw-pixel asset pack for fast cold starts.
+
+The pack is one file holding every sprite of ATLAS_DIRS already scaled for a
+display scale, stored as raw BGRA pixels behind a small JSON index. At runtime
+the file is memory-mapped and surfaces are created with pygame.image.frombuffer,
+so no PNG is decoded and nothing is rescaled.
+
+GamePanel opens it automatically (AssetPack.open); it is rebuilt on the fly when
+a source PNG is added, removed or modified. It can also be built ahead of time:
+
+    python asset_pack.py --scale 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import pygame
+
+from atlas import ATLAS_DIRS
+
+
+PACK_MAGIC = b"EDPK"
+PACK_VERSION = 1
+PIXEL_FORMAT = "BGRA"
+
+_HEADER = struct.Struct("<4sII")  # magic, version, index length
+_ALIGN = 16
+
+
+def default_pack_path(project_dir: Path, scale: int):
+    return project_dir / ".asset_cache" / f"assets_x{scale}.pack"
+
+
+def _source_files(project_dir: Path):
+    files = []
+    for dir_name in ATLAS_DIRS:
+        files.extend(sorted((project_dir / dir_name).glob("*.png")))
+    return files
+
+
+def _source_stamps(project_dir: Path):
+    stamps = {}
+    for path in _source_files(project_dir):
+        st = path.stat()
+        stamps[path.relative_to(project_dir).as_posix()] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def _align(n: int):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def build_pack(project_dir: Path, scale: int, pack_path: Path | None = None):
+    """Decode, scale and write every source sprite into one raw-pixel pack file."""
+    if pack_path is None:
+        pack_path = default_pack_path(project_dir, scale)
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+
+    sprites = {}
+    blobs = []
+    offset = 0
+    for path in _source_files(project_dir):
+        try:
+            img = pygame.image.load(str(path))
+        except Exception:
+            continue
+        if scale != 1:
+            img = pygame.transform.scale(img, (img.get_width() * scale, img.get_height() * scale))
+        data = pygame.image.tobytes(img, PIXEL_FORMAT)
+        sprites[path.relative_to(project_dir).as_posix()] = [offset, img.get_width(), img.get_height()]
+        blobs.append(data)
+        offset = _align(offset + len(data))
+
+    index = {"scale": scale, "format": PIXEL_FORMAT, "sprites": sprites, "sources": _source_stamps(project_dir)}
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+    data_start = _align(_HEADER.size + len(index_bytes))
+
+    # Write to a temp file first so a crash never leaves a half-written pack behind.
+    tmp_path = pack_path.with_suffix(pack_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(b"\0" * (data_start - _HEADER.size - len(index_bytes)))
+        for data in blobs:
+            f.write(data)
+            f.write(b"\0" * (_align(len(data)) - len(data)))
+    os.replace(tmp_path, pack_path)
+    return index
+
+
+def _read_index(pack_path: Path):
+    with open(pack_path, "rb") as f:
+        magic, version, index_len = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            return None, 0
+        index = json.loads(f.read(index_len).decode("utf-8"))
+    return index, _align(_HEADER.size + index_len)
+
+
+class AssetPack:
+    """Runtime view of a memory-mapped pack: relative sprite path -> surface."""
+
+    def __init__(self, root: Path, pack_path: Path, index: dict, data_start: int):
+        self.root = root
+        self.scale = index["scale"]
+        self._sprites = index["sprites"]
+        self._data_start = data_start
+        self._surfaces: dict[str, pygame.Surface] = {}
+
+        self._file = open(pack_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        # Surfaces built straight on the mapping only blit fast if the display uses the same layout.
+        probe = pygame.image.frombuffer(bytes(4), (1, 1), PIXEL_FORMAT)
+        try:
+            native = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        except pygame.error:
+            native = probe.get_masks()
+        self._needs_convert = native != probe.get_masks()
+
+    @classmethod
+    def open(cls, project_dir: Path, scale: int, pack_path: Path | None = None, rebuild: bool = True):
+        """Open the pack for `scale`, (re)building it first if it is missing or stale.
+
+        Returns None if the pack can't be built or read (the game then loads PNGs as usual).
+        """
+        if pack_path is None:
+            pack_path = default_pack_path(project_dir, scale)
+        try:
+            index, data_start = (None, 0)
+            if pack_path.exists():
+                index, data_start = _read_index(pack_path)
+            stale = (
+                index is None
+                or index.get("scale") != scale
+                or index.get("format") != PIXEL_FORMAT
+                or index.get("sources") != _source_stamps(project_dir)
+            )
+            if stale:
+                if not rebuild:
+                    return None
+                build_pack(project_dir, scale, pack_path)
+                index, data_start = _read_index(pack_path)
+            return cls(project_dir, pack_path, index, data_start)
+        except Exception:
+            return None
+
+    def get(self, path: Path, scale: int):
+        """Return the sprite for `path` at `scale`, or None if the pack doesn't have it."""
+        if scale != self.scale:
+            return None
+        try:
+            name = Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return None
+
+        surf = self._surfaces.get(name)
+        if surf is None:
+            entry = self._sprites.get(name)
+            if entry is None:
+                return None
+            offset, w, h = entry
+            start = self._data_start + offset
+            surf = pygame.image.frombuffer(self._view[start : start + w * h * 4], (w, h), PIXEL_FORMAT)
+            if self._needs_convert:
+                surf = surf.convert_alpha()
+            self._surfaces[name] = surf
+        return surf
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-scaled raw-pixel asset pack.")
+    parser.add_argument("--scale", type=int, default=3, help="display scale to pre-scale sprites by (default: 3)")
+    args = parser.parse_args()
+
+    project_dir = Path(__file__).resolve().parent
+    pack_path = default_pack_path(project_dir, args.scale)
+    index = build_pack(project_dir, args.scale, pack_path)
+    print(f"Packed {len(index['sprites'])} sprites into {pack_path} ({pack_path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
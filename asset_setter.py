@@ -6,18 +6,18 @@ from orc_monster import Orc
 from player import Player
 
 
-def spawn_entities_from_map(
-    project_dir: Path,
-    rows: list[str],
-    tile_size: int,
-    display_scale: int,
-    map_name: str,
-    spawn_tile: tuple[int, int] | None = None,
-):
-    cleaned_rows = list(rows)
+# Every monster type a map can spawn (used to preload their sprites).
+MONSTER_TYPES = (Bat, GreenSlime, Orc)
 
-    h = len(cleaned_rows)
-    w = len(cleaned_rows[0]) if h > 0 else 0
+
+def map_layout(rows: list[str], map_name: str):
+    """Where the player, monsters and objects go on a map.
+
+    Pure data (no pygame objects), so it is safe to compute off the main thread.
+    Returns (spawn_player, bat_tiles, slime_tiles, orc_tiles, objects).
+    """
+    h = len(rows)
+    w = len(rows[0]) if h > 0 else 0
 
     def in_bounds(t: tuple[int, int]):
         return 0 <= t[0] < w and 0 <= t[1] < h
@@ -59,6 +59,31 @@ def spawn_entities_from_map(
     orc_tiles = [t for t in orc_tiles if in_bounds(t)]
     objects = {t: s for t, s in objects.items() if in_bounds(t)}
 
+    return spawn_player, bat_tiles, slime_tiles, orc_tiles, objects
+
+
+def spawn_entities_from_map(
+    project_dir: Path,
+    rows: list[str],
+    tile_size: int,
+    display_scale: int,
+    map_name: str,
+    spawn_tile: tuple[int, int] | None = None,
+    layout=None,
+):
+    cleaned_rows = list(rows)
+
+    h = len(cleaned_rows)
+    w = len(cleaned_rows[0]) if h > 0 else 0
+
+    def in_bounds(t: tuple[int, int]):
+        return 0 <= t[0] < w and 0 <= t[1] < h
+
+    # `layout` can be precomputed (e.g. by the map prefetcher); otherwise compute it now.
+    if layout is None:
+        layout = map_layout(cleaned_rows, map_name)
+    spawn_player, bat_tiles, slime_tiles, orc_tiles, objects = layout
+
     player_assets_dir = project_dir / "player"
     if spawn_tile is not None and in_bounds(spawn_tile):
         player_pos = (spawn_tile[0] * tile_size, spawn_tile[1] * tile_size)
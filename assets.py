@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from pathlib import Path
 
 import pygame
@@ -7,22 +8,251 @@ import pygame
 # Keeping this in a separate file lets the rest of the game stay focused on gameplay.
 
 
-def load_image(path: Path, size=None):
+# Optional pre-built image sources. When set, load_image serves sprites from them:
+# - the memory-mapped raw-pixel pack (see asset_pack.py)
+# - the texture atlas (see atlas.py)
+_pack = None
+_atlas = None
+
+
+def set_asset_pack(pack):
+    """Serve images from `pack` (an AssetPack) when possible. Pass None to disable."""
+    global _pack
+    _pack = pack
+
+
+def set_atlas(atlas):
+    """Serve images from `atlas` (a TextureAtlas) when possible. Pass None to disable."""
+    global _atlas
+    _atlas = atlas
+
+
+def _prebuilt_image(path: Path, scale: int):
+    for source in (_pack, _atlas):
+        if source is not None:
+            img = source.get(path, scale)
+            if img is not None:
+                return img
+    return None
+
+
+class ImageCache:
+    """Process-wide LRU cache of loaded (and scaled) images with a memory budget.
+
+    Keys are (path, size, scale). Every map transition rebuilds the player and the
+    monsters; with the cache warm they get the already-scaled surfaces back without
+    touching the disk or running pygame.transform.scale.
+    """
+
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def surface_bytes(surf: pygame.Surface):
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def put(self, key, surf: pygame.Surface):
+        cost = self.surface_bytes(surf)
+        if cost > self.budget_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= old[1]
+        self._entries[key] = (surf, cost)
+        self.used_bytes += cost
+        self._evict()
+
+    def set_budget(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def _evict(self):
+        while self.used_bytes > self.budget_bytes and self._entries:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self.used_bytes -= cost
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by every loader in the process.
+image_cache = ImageCache()
+
+
+def _image_key(path: Path, size, scale: int):
+    return (str(path), tuple(size) if size is not None else None, scale)
+
+
+def is_image_ready(path: Path, scale: int = 1):
+    """True if load_image(path, scale=scale) would not touch the disk."""
+    return _image_key(path, None, scale) in image_cache or _prebuilt_image(path, scale) is not None
+
+
+def has_image(path: Path, scale: int = 1):
+    """True if `path` can be loaded at `scale` (checks the caches before the disk)."""
+    if _image_key(path, None, scale) in image_cache:
+        return True
+    if _prebuilt_image(path, scale) is not None:
+        return True
+    return Path(path).exists()
+
+
+def load_image(path: Path, size=None, scale: int = 1):
     """Load an image from disk.
 
     - If `size` is provided, the image is scaled to that size.
+    - Otherwise, if `scale` is not 1, the image is scaled by that integer factor
+      (pixel-art friendly, keeps the original proportions).
+    - If an asset pack or texture atlas is active and has the image at this
+      scale, its pre-scaled surface is returned instead of reading the file.
+    - Loaded images are kept in `image_cache`, so asking again for the same
+      (path, size, scale) returns the same surface. Don't modify it in place.
     - If the file can't be loaded, we return a magenta placeholder surface so the
       game can still run.
     """
-    try:
-        img = pygame.image.load(str(path)).convert_alpha()
-        if size is not None:
-            img = pygame.transform.scale(img, size)
+    if size is None:
+        img = _prebuilt_image(path, scale)
+        if img is not None:
+            return img
+
+    key = _image_key(path, size, scale)
+    img = image_cache.get(key)
+    if img is not None:
         return img
+
+    try:
+        raw = pygame.image.load(str(path))
+    except Exception:
+        raw = None
+    return finish_image(raw, path, size=size, scale=scale)
+
+
+def finish_image(raw, path: Path, size=None, scale: int = 1):
+    """Second half of load_image: convert a decoded image for the display, scale and cache it.
+
+    Split out so decoding can happen elsewhere (e.g. on a worker thread, see asset_loader.py)
+    while this part runs on the main thread. `raw` is None if decoding failed.
+    """
+    try:
+        if raw is None:
+            raise ValueError(f"could not decode {path}")
+        img = raw.convert_alpha()
     except Exception:
         # Placeholder (magenta) makes missing assets very visible.
+        # Not cached: the file (or the display) may become available later.
         if size is None:
-            size = (32, 32)
+            size = (32 * scale, 32 * scale)
         surf = pygame.Surface(size, pygame.SRCALPHA)
         surf.fill((255, 0, 255, 255))
         return surf
+
+    if size is not None:
+        img = pygame.transform.scale(img, size)
+    elif scale != 1:
+        img = pygame.transform.scale(img, (img.get_width() * scale, img.get_height() * scale))
+
+    image_cache.put(_image_key(path, size, scale), img)
+    return img
+
+
+class SurfaceVariantCache:
+    """Small LRU cache of derived surfaces (alpha fades, hit flashes, HP-bar fills).
+
+    Effects like "blink while hit" or "fade out while dying" used to copy the sprite
+    and call set_alpha() every frame. Alpha is quantized to `alpha_levels` steps so a
+    fade reuses a handful of precomputed surfaces instead of allocating new ones.
+    """
+
+    def __init__(self, max_entries: int = 512, alpha_levels: int = 16):
+        self.max_entries = max_entries
+        self.alpha_levels = max(2, alpha_levels)
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def alpha_bucket(self, alpha: float) -> int:
+        alpha = max(0, min(255, int(alpha)))
+        return round(alpha * (self.alpha_levels - 1) / 255)
+
+    def bucket_alpha(self, bucket: int) -> int:
+        return round(bucket * 255 / (self.alpha_levels - 1))
+
+    def _get(self, key, build):
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = build()
+        self._entries[key] = surf
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+    def with_alpha(self, img: pygame.Surface, alpha: float, effect: str = "alpha"):
+        """Return a copy of `img` drawn at (quantized) `alpha`."""
+        bucket = self.alpha_bucket(alpha)
+        if bucket == self.alpha_levels - 1 and effect == "alpha":
+            return img
+
+        def build():
+            surf = img.copy()
+            surf.set_alpha(self.bucket_alpha(bucket))
+            return surf
+
+        return self._get((img, bucket, effect), build)
+
+    def filled(self, size: tuple[int, int], color: tuple[int, int, int], alpha: float = 255):
+        """Return a SRCALPHA surface of `size` filled with `color` at (quantized) `alpha`."""
+        bucket = self.alpha_bucket(alpha)
+
+        def build():
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill((*color, self.bucket_alpha(bucket)))
+            return surf
+
+        return self._get(("fill", size, color, bucket), build)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by every sprite so identical fades/flashes reuse the same surfaces.
+variant_cache = SurfaceVariantCache()
@@ -0,0 +1,158 @@
+"""Texture atlas: pack the game's sprite PNGs into a few pre-scaled sheets.
+
+Build it once (per display scale) with:
+
+    python atlas.py --scale 3
+
+This writes `atlas/sheet0.png`, `atlas/sheet1.png`, ... and `atlas/index.json`.
+At runtime GamePanel loads the atlas if it exists and `assets.load_image` hands
+out subsurfaces of the sheets instead of opening every PNG one by one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import pygame
+
+
+ATLAS_DIRS = ("tiles", "objects", "player", "monster")
+ATLAS_VERSION = 1
+
+
+def _pack_shelves(sizes: dict[str, tuple[int, int]], max_size: int):
+    """Shelf-pack rectangles into sheets of at most max_size x max_size.
+
+    Returns ({name: (sheet, x, y)}, [(sheet_w, sheet_h), ...]).
+    """
+    placements: dict[str, tuple[int, int, int]] = {}
+    sheets: list[tuple[int, int]] = []
+
+    sheet = 0
+    x = y = 0
+    shelf_h = 0
+    used_w = 0
+
+    # Tallest first keeps shelves tight.
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if x + w > max_size:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        if y + h > max_size:
+            sheets.append((used_w, y + shelf_h))
+            sheet += 1
+            x = y = shelf_h = used_w = 0
+
+        placements[name] = (sheet, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x)
+
+    if placements:
+        sheets.append((used_w, y + shelf_h))
+    return placements, sheets
+
+
+def build_atlas(project_dir: Path, scale: int, out_dir: Path | None = None, max_size: int = 2048):
+    """Pack every PNG of ATLAS_DIRS (scaled by `scale`) into sheets + a JSON index."""
+    if out_dir is None:
+        out_dir = project_dir / "atlas"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    images: dict[str, pygame.Surface] = {}
+    for dir_name in ATLAS_DIRS:
+        for path in sorted((project_dir / dir_name).glob("*.png")):
+            try:
+                img = pygame.image.load(str(path))
+            except Exception:
+                continue
+            if scale != 1:
+                img = pygame.transform.scale(img, (img.get_width() * scale, img.get_height() * scale))
+            images[path.relative_to(project_dir).as_posix()] = img
+
+    sizes = {name: img.get_size() for name, img in images.items()}
+    placements, sheet_sizes = _pack_shelves(sizes, max_size)
+
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    sprites = {}
+    for name, (sheet, x, y) in placements.items():
+        sheets[sheet].blit(images[name], (x, y))
+        w, h = sizes[name]
+        sprites[name] = [sheet, x, y, w, h]
+
+    sheet_files = []
+    for i, surf in enumerate(sheets):
+        file_name = f"sheet{i}.png"
+        pygame.image.save(surf, str(out_dir / file_name))
+        sheet_files.append(file_name)
+
+    index = {"version": ATLAS_VERSION, "scale": scale, "sheets": sheet_files, "sprites": sprites}
+    (out_dir / "index.json").write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+    return index
+
+
+class TextureAtlas:
+    """Runtime view of a built atlas: relative sprite path -> subsurface of a sheet."""
+
+    def __init__(self, root: Path, scale: int, sheets: list[pygame.Surface], sprites: dict[str, list[int]]):
+        self.root = root
+        self.scale = scale
+        self.sheets = sheets
+        self._sprites = sprites
+        self._subsurfaces: dict[str, pygame.Surface] = {}
+
+    @classmethod
+    def load(cls, project_dir: Path, scale: int, atlas_dir: Path | None = None):
+        """Load the atlas built for `scale`. Returns None if it is missing or unusable."""
+        if atlas_dir is None:
+            atlas_dir = project_dir / "atlas"
+        index_path = atlas_dir / "index.json"
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") != ATLAS_VERSION or index.get("scale") != scale:
+                return None
+            sheets = [pygame.image.load(str(atlas_dir / name)).convert_alpha() for name in index["sheets"]]
+        except Exception:
+            return None
+        return cls(project_dir, scale, sheets, index["sprites"])
+
+    def get(self, path: Path, scale: int):
+        """Return the sprite for `path` at `scale`, or None if the atlas doesn't have it."""
+        if scale != self.scale:
+            return None
+        try:
+            name = Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return None
+
+        surf = self._subsurfaces.get(name)
+        if surf is None:
+            entry = self._sprites.get(name)
+            if entry is None:
+                return None
+            sheet, x, y, w, h = entry
+            surf = self.sheets[sheet].subsurface(pygame.Rect(x, y, w, h))
+            self._subsurfaces[name] = surf
+        return surf
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sprite texture atlas.")
+    parser.add_argument("--scale", type=int, default=3, help="display scale to pre-scale sprites by (default: 3)")
+    parser.add_argument("--max-size", type=int, default=2048, help="maximum sheet width/height in pixels")
+    args = parser.parse_args()
+
+    project_dir = Path(__file__).resolve().parent
+    index = build_atlas(project_dir, args.scale, max_size=args.max_size)
+    print(f"Packed {len(index['sprites'])} sprites into {len(index['sheets'])} sheet(s) in {project_dir / 'atlas'}")
+
+
+if __name__ == "__main__":
+    main()
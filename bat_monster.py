@@ -2,12 +2,14 @@ from monster import Monster
 
 
 class Bat(Monster):
+    sprite_name = "bat_down_1.png"
+
     def __init__(self, pos_px, tile_size: int, assets_dir, scale: int = 1):
         super().__init__(
             pos_px,
             tile_size,
             assets_dir,
-            "bat_down_1.png",
+            self.sprite_name,
             max_hp=2,
             scale=scale,
             aggro_tiles=6,
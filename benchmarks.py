@@ -0,0 +1,333 @@
+"""Micro-benchmarks for the engine's hot paths, with stored baselines.
+
+Covers pathfinding.astar (callback and BlockedGrid engines), BlockedGrid.jps,
+pathfinding.distance_field, pathfinding.inflate_blocked, WorldMap.rebuild_blocked,
+WorldMap.colliders_for_rect, map_loader.load_map_file and
+asset_setter.spawn_entities_from_map, each run against the shipped maps/ and
+against synthetic maps (30x20 up to 2000x2000) with random walls and an open
+field with a few wall blocks.
+
+    python benchmarks.py --save       # record benchmarks_baseline.json
+    python benchmarks.py              # compare against it, flag regressions
+    python benchmarks.py --quick      # skip the largest synthetic maps
+    python benchmarks.py -k astar     # only cases whose name contains "astar"
+
+The comparison exits with status 1 if any case's median time per call got
+slower than the baseline's by more than --threshold (default 25%) and by more
+than MIN_FLAG_S. Every case is timed in runs of ~RUN_TIME until CASE_BUDGET is
+spent, so fast cases get many runs and their median settles; baselines are only
+meaningful on the machine that recorded them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = PROJECT_DIR / "benchmarks_baseline.json"
+
+# (width, height) of the synthetic maps; the ones above QUICK_MAX_TILES are skipped by --quick.
+SYNTHETIC_SIZES = [(30, 20), (100, 100), (500, 500), (2000, 2000)]
+QUICK_MAX_TILES = 500 * 500
+WALL_DENSITY = 0.04  # sparse: walls are inflated by a tile for pathfinding
+# (width, height, wall blocks) of open grass fields, where Jump Point Search pays off.
+OPEN_FIELDS = [(300, 300, 40)]
+
+TILE_SIZE = 48
+DISPLAY_SCALE = 3
+
+ASTAR_QUERIES = 20
+ASTAR_NEAR_RADIUS = 12  # about a monster's aggro range
+COLLIDER_QUERIES = 1000
+FLOW_RADIUS = 13  # largest aggro radius + FlowField.DETOUR_TILES
+
+# Each case is timed in runs of about RUN_TIME seconds, repeated until CASE_BUDGET
+# seconds are spent (and at least --repeat times).
+RUN_TIME = 0.05
+CASE_BUDGET = 1.0
+# Slowdowns smaller than this per call are never flagged (timer and scheduling jitter).
+MIN_FLAG_S = 20e-6
+
+
+def _init_pygame():
+    # Player and Monster load sprites with convert_alpha(), which needs a display.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+
+def open_field_rows(w: int, h: int, obstacles: int, seed: int = 0):
+    """A w x h grass field with a wall border and `obstacles` random wall blocks (2-12 tiles a side)."""
+    rng = random.Random(seed)
+    grid = [["#" if x in (0, w - 1) or y in (0, h - 1) else "." for x in range(w)] for y in range(h)]
+    for _ in range(obstacles):
+        x0, y0 = rng.randrange(w), rng.randrange(h)
+        for y in range(y0, min(h, y0 + rng.randint(2, 12))):
+            for x in range(x0, min(w, x0 + rng.randint(2, 12))):
+                grid[y][x] = "#"
+    return ["".join(row) for row in grid]
+
+
+def random_wall_rows(w: int, h: int, density: float = WALL_DENSITY, seed: int = 0):
+    """A w x h map of grass with a wall border and `density` of the inner tiles walled."""
+    rng = random.Random(seed)
+    rows = ["#" * w]
+    for _ in range(h - 2):
+        inner = "".join("#" if rng.random() < density else "." for _ in range(w - 2))
+        rows.append("#" + inner + "#")
+    rows.append("#" * w)
+    return rows
+
+
+class BenchMap:
+    def __init__(self, name: str, path: Path, map_name: str):
+        self.name = name
+        self.path = path
+        self.map_name = map_name
+
+
+def bench_maps(tmp_dir: Path, quick: bool):
+    maps = [BenchMap(p.stem, p, p.name) for p in sorted((PROJECT_DIR / "maps").glob("*.txt"))]
+    for w, h in SYNTHETIC_SIZES:
+        if quick and w * h > QUICK_MAX_TILES:
+            continue
+        path = tmp_dir / f"random_{w}x{h}.txt"
+        path.write_text("\n".join(random_wall_rows(w, h, seed=w * 7919 + h)) + "\n", encoding="utf-8")
+        maps.append(BenchMap(f"random_{w}x{h}", path, path.name))
+    for w, h, obstacles in OPEN_FIELDS:
+        path = tmp_dir / f"field_{w}x{h}.txt"
+        path.write_text("\n".join(open_field_rows(w, h, obstacles, seed=w)) + "\n", encoding="utf-8")
+        maps.append(BenchMap(f"field_{w}x{h}", path, path.name))
+    return maps
+
+
+def time_call(fn, min_time: float = RUN_TIME, repeat: int = 3, budget: float = CASE_BUDGET):
+    """Best and median seconds per call of fn(), over runs of ~min_time each.
+
+    Runs are repeated until `budget` seconds are spent, and at least `repeat` times.
+    """
+    fn()  # warm-up (and a first estimate)
+    t0 = time.perf_counter()
+    fn()
+    once = time.perf_counter() - t0
+    number = max(1, int(min_time / once)) if once > 0 else 1000
+
+    per_call = []
+    started = time.perf_counter()
+    while len(per_call) < repeat or time.perf_counter() - started < budget:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - t0) / number)
+    per_call.sort()
+    return {"best_s": per_call[0], "median_s": per_call[len(per_call) // 2], "calls": number, "runs": len(per_call)}
+
+
+def _astar_pairs(world, rng: random.Random, near: bool):
+    open_tiles = [(x, y) for y in range(world.h) for x in range(world.w) if not world.is_blocked_tile(x, y)]
+    if not open_tiles:
+        return []
+    pairs = []
+    for _ in range(ASTAR_QUERIES):
+        start = rng.choice(open_tiles)
+        if near:
+            candidates = [
+                (start[0] + dx, start[1] + dy)
+                for dx in range(-ASTAR_NEAR_RADIUS, ASTAR_NEAR_RADIUS + 1)
+                for dy in range(-ASTAR_NEAR_RADIUS, ASTAR_NEAR_RADIUS + 1)
+            ]
+            candidates = [t for t in candidates if 0 <= t[0] < world.w and 0 <= t[1] < world.h]
+            candidates = [t for t in candidates if not world.is_blocked_tile(*t)]
+            goal = rng.choice(candidates)
+        else:
+            goal = rng.choice(open_tiles)
+        pairs.append((start, goal))
+    return pairs
+
+
+def cases_for(bench_map: BenchMap, solid_tiles: set[str]):
+    """Yield (case name, callable) for every benchmark on `bench_map`."""
+    import pygame
+
+    from asset_setter import map_layout, spawn_entities_from_map
+    from hpa import HierarchicalPathfinder
+    from map_loader import load_map_file
+    from pathfinding import astar, distance_field, inflate_blocked
+    from world_map import WorldMap
+
+    rows = load_map_file(bench_map.path)
+    layout = map_layout(rows, bench_map.map_name)
+    world = WorldMap(list(rows), TILE_SIZE, solid_tiles, objects=dict(layout[4]))
+    name = bench_map.name
+    rng = random.Random(name)
+
+    yield f"load_map_file[{name}]", lambda: load_map_file(bench_map.path)
+
+    base_blocked = {(x, y) for y, row in enumerate(rows) for x, ch in enumerate(row) if ch in solid_tiles}
+    yield f"inflate_blocked[{name}]", lambda: inflate_blocked(base_blocked, world.w, world.h, 1)
+
+    yield f"rebuild_blocked[{name}]", world.rebuild_blocked
+
+    rects = [
+        pygame.Rect(rng.randrange(world.pixel_width), rng.randrange(world.pixel_height), TILE_SIZE, TILE_SIZE)
+        for _ in range(COLLIDER_QUERIES)
+    ]
+
+    def colliders():
+        for r in rects:
+            world.colliders_for_rect(r)
+
+    yield f"colliders_for_rect[{name}] x{COLLIDER_QUERIES}", colliders
+
+    yield f"hpa_build[{name}]", lambda: HierarchicalPathfinder(world.blocked_grid)
+    # Cluster distances are filled in lazily; time_call's warm-up run fills them for these queries.
+    hpa = HierarchicalPathfinder(world.blocked_grid)
+
+    for label, near in (("near", True), ("far", False)):
+        pairs = _astar_pairs(world, rng, near)
+
+        def paths(pairs=pairs):
+            for start, goal in pairs:
+                astar(start, goal, world.is_blocked_tile, world.w, world.h)
+
+        yield f"astar_{label}[{name}] x{len(pairs)}", paths
+
+        def grid_paths(pairs=pairs):
+            for start, goal in pairs:
+                astar(start, goal, world.blocked_grid, world.w, world.h)
+
+        yield f"astar_grid_{label}[{name}] x{len(pairs)}", grid_paths
+
+        def jps_paths(pairs=pairs):
+            for start, goal in pairs:
+                world.blocked_grid.jps(start, goal)
+
+        yield f"jps_{label}[{name}] x{len(pairs)}", jps_paths
+
+        def hpa_paths(pairs=pairs):
+            for start, goal in pairs:
+                hpa.find_path(start, goal)
+
+        yield f"hpa_{label}[{name}] x{len(pairs)}", hpa_paths
+
+    goals = [goal for _, goal in _astar_pairs(world, rng, near=False)]
+
+    def fields():
+        for goal in goals:
+            distance_field(goal, world.is_blocked_tile, world.w, world.h, FLOW_RADIUS)
+
+    yield f"distance_field[{name}] x{len(goals)}", fields
+
+    def spawn():
+        spawn_entities_from_map(PROJECT_DIR, rows, TILE_SIZE, DISPLAY_SCALE, bench_map.map_name, layout=layout)
+
+    yield f"spawn_entities_from_map[{name}]", spawn
+
+
+def run_benchmarks(
+    quick: bool = False,
+    pattern: str | None = None,
+    repeat: int = 3,
+    min_time: float = RUN_TIME,
+    budget: float = CASE_BUDGET,
+):
+    _init_pygame()
+    from tileset import TileSet
+
+    solid_tiles = TileSet(PROJECT_DIR / "tiles", DISPLAY_SCALE).solid_tiles
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for bench_map in bench_maps(Path(tmp), quick):
+            for name, fn in cases_for(bench_map, solid_tiles):
+                if pattern and pattern not in name:
+                    continue
+                results[name] = time_call(fn, min_time=min_time, repeat=repeat, budget=budget)
+                print(f"  {name:48} {_fmt(results[name]['median_s'])}", file=sys.stderr)
+    return results
+
+
+def _fmt(seconds: float):
+    if seconds >= 1.0:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.3f} us"
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Report lines and the names of the cases whose median got slower than the baseline's
+    by more than `threshold` (and by more than MIN_FLAG_S)."""
+    lines = [f"{'case':48} {'baseline':>11} {'current':>11} {'ratio':>7}"]
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:48} {'-':>11} {_fmt(cur['median_s'])} {'':>7}  new")
+            continue
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] > 0 else 1.0
+        diff = cur["median_s"] - base["median_s"]
+        flag = ""
+        if ratio > 1.0 + threshold and diff > MIN_FLAG_S:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1.0 / (1.0 + threshold) and -diff > MIN_FLAG_S:
+            flag = "  faster"
+        lines.append(f"{name:48} {_fmt(base['median_s'])} {_fmt(cur['median_s'])} {ratio:6.2f}x{flag}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the engine micro-benchmarks and compare against a baseline.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown ratio flagged as a regression")
+    parser.add_argument("--quick", action="store_true", help="skip the largest synthetic maps")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum timed runs per case")
+    parser.add_argument(
+        "--budget", type=float, default=CASE_BUDGET, help="seconds of timed runs per case (the median is compared)"
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_DIR))
+    results = run_benchmarks(quick=args.quick, pattern=args.pattern, repeat=args.repeat, budget=args.budget)
+
+    if args.save:
+        data = {}
+        if args.baseline.exists():
+            # Partial runs (-k, --quick) only replace the cases they ran.
+            data = json.loads(args.baseline.read_text(encoding="utf-8"))
+        data.setdefault("cases", {}).update(results)
+        data["machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+        args.baseline.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved {len(results)} cases to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save first.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    lines, regressions = compare(results, baseline.get("cases", {}), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: " + ", ".join(regressions))
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
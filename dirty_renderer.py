@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from game_panel import GamePanel
+
+
+class DirtyRectRenderer:
+    """Optional presenter that only redraws and pushes the parts of the screen that changed.
+
+    Each frame it collects the screen areas covered by moving entities (this frame and
+    the previous one) and by world tiles that changed (chests, drops, pickups), redraws
+    only those areas (the chunks and monsters under each one) and presents them with
+    pygame.display.update(rects).
+
+    It falls back to a full redraw + flip when the camera scrolls, the map changes,
+    the HUD/overlay state changes, or the dirty area covers most of the screen or is
+    split into too many rects.
+    """
+
+    def __init__(self, screen: pygame.Surface, full_redraw_ratio: float = 0.5, max_dirty_rects: int = 16):
+        self.screen = screen
+        self.full_redraw_ratio = full_redraw_ratio
+        # Each rect costs a few blits and its share of the scene walk; past this many a full
+        # frame is cheaper.
+        self.max_dirty_rects = max_dirty_rects
+        self._screen_rect = screen.get_rect()
+        self._prev_rects: list[pygame.Rect] = []
+        self._prev_state = None
+        self._force_full = True
+
+        # Stats (useful when tuning on slow machines).
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.last_dirty_count = 0
+
+    def force_full(self):
+        """Make the next present() redraw and flip the whole screen."""
+        self._force_full = True
+
+    def _entity_rects(self, gp: GamePanel, ox: int, oy: int):
+        # Screen rects: one per monster (in gp.monsters order), then the player and overlays.
+        rects = [m.get_draw_rect().move(-ox, -oy) for m in gp.monsters]
+        if gp.player is not None:
+            rects.append(gp.player.get_draw_rect().move(-ox, -oy))
+        if gp.show_profiler:
+            # The profiler overlay changes every frame.
+            rects.append(gp.profiler.overlay_rect)
+        return rects
+
+    def _ui_state(self, gp: GamePanel):
+        # Anything that changes what the UI draws forces a full frame (overlays cover the screen).
+        return (
+            gp.player.hp,
+            gp.player.max_hp,
+            gp.paused,
+            gp.game_over,
+            gp.inventory_open,
+            gp.victory,
+            tuple(gp.inventory.items()),
+            gp.monsters_killed,
+            gp.total_coins_collected,
+            gp.show_profiler,
+        )
+
+    def _merge(self, rects: list[pygame.Rect]):
+        merged: list[pygame.Rect] = []
+        for r in rects:
+            r = r.clip(self._screen_rect)
+            if r.w <= 0 or r.h <= 0:
+                continue
+            i = r.collidelist(merged)
+            while i != -1:
+                r = r.union(merged.pop(i))
+                i = r.collidelist(merged)
+            merged.append(r)
+        return merged
+
+    def present(self, gp: GamePanel):
+        ox = int(gp.camera.offset.x)
+        oy = int(gp.camera.offset.y)
+        state = (id(gp.world), ox, oy, self._ui_state(gp))
+        changed_tiles = gp.world.take_changed_tiles()
+        entity_rects = self._entity_rects(gp, ox, oy)
+
+        full = self._force_full or state != self._prev_state or changed_tiles is None
+        dirty: list[pygame.Rect] = []
+        if not full:
+            ts = gp.tile_size
+            dirty = self._merge(
+                self._prev_rects
+                + entity_rects
+                + [pygame.Rect(tx * ts - ox, ty * ts - oy, ts, ts) for tx, ty in changed_tiles]
+            )
+            area = sum(r.w * r.h for r in dirty)
+            screen_area = self._screen_rect.w * self._screen_rect.h
+            if area > screen_area * self.full_redraw_ratio or len(dirty) > self.max_dirty_rects:
+                full = True
+
+        if full:
+            gp.draw_frame()
+            with gp.profiler.phase("present"):
+                pygame.display.flip()
+            self.full_frames += 1
+            self.last_dirty_count = 1
+        else:
+            if dirty:
+                # One pass over the scene for all rects, each only drawing what's under it.
+                gp.draw_frame(areas=dirty, monster_rects=entity_rects)
+                with gp.profiler.phase("present"):
+                    pygame.display.update(dirty)
+            self.partial_frames += 1
+            self.last_dirty_count = len(dirty)
+
+        self._prev_rects = entity_rects
+        self._prev_state = state
+        self._force_full = False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from map_loader import load_map_file
@@ -58,6 +59,32 @@ class EventHandler:
     def in_cave(self) -> bool:
         return self._in_cave
 
+    def adjacent_maps(self) -> list[tuple[Path, str]]:
+        """(path, map name) of every map reachable from the current one (for prefetching)."""
+        gp = self.gp
+        if self._in_cave:
+            return [(gp.map_dir / "house.txt", "house.txt")]
+        if self._in_interior:
+            targets = [(gp.map_dir / "cave.txt", "cave.txt")]
+            if self._return_map_index is not None:
+                path = gp.map_files[self._return_map_index]
+                targets.append((path, path.name))
+            return targets
+
+        targets = [(gp.map_dir / "house.txt", "house.txt")]
+        for index in (gp.current_map_index - 1, gp.current_map_index + 1):
+            if 0 <= index < len(gp.map_files):
+                path = gp.map_files[index]
+                targets.append((path, path.name))
+        return targets
+
+    def _load_rows(self, path: Path, map_name: str):
+        """Set gp.raw_rows for `path`, using the prefetched map if there is one. Returns it (or None)."""
+        gp = self.gp
+        prepared = gp.prefetcher.take(path, map_name)
+        gp.raw_rows = prepared.rows if prepared is not None else load_map_file(path)
+        return prepared
+
     # ------------------------------------------------------------------
     # key-event interactions  (called from game_panel's event loop for K_x)
     # ------------------------------------------------------------------
@@ -162,8 +189,8 @@ class EventHandler:
         self._in_interior = True
         self._in_cave = False
 
-        gp.raw_rows = load_map_file(gp.map_dir / "house.txt")
-        gp.reset_game(spawn_tile=(7, 7))
+        prepared = self._load_rows(gp.map_dir / "house.txt", "house.txt")
+        gp.reset_game(spawn_tile=(7, 7), prepared=prepared)
         # Restore persisted house object state if available.
         if self._saved_house_objects is not None:
             gp.world.objects = self._saved_house_objects
@@ -180,6 +207,14 @@ class EventHandler:
         # Persist current house object state for next visit.
         self._saved_house_objects = dict(gp.world.objects)
 
+        # The outer map was prefetched from the file; only use it if it matches the rows we left.
+        prepared = None
+        if self._return_map_index is not None:
+            path = gp.map_files[self._return_map_index]
+            prepared = gp.prefetcher.take(path, path.name)
+            if prepared is not None and prepared.rows != self._return_raw_rows:
+                prepared = None
+
         gp.raw_rows = self._return_raw_rows
         if self._return_map_index is not None:
             gp.current_map_index = self._return_map_index
@@ -190,7 +225,7 @@ class EventHandler:
         self._return_spawn_tile = None
         self._in_interior = False
         self._in_cave = False
-        gp.reset_game(spawn_tile=spawn_tile)
+        gp.reset_game(spawn_tile=spawn_tile, prepared=prepared)
         gp._fade("in")
 
     def _enter_cave(self):
@@ -200,8 +235,8 @@ class EventHandler:
         self._saved_house_objects = dict(gp.world.objects)
         self._in_cave = True
         self._in_interior = False
-        gp.raw_rows = load_map_file(gp.map_dir / "cave.txt")
-        gp.reset_game(spawn_tile=None)
+        prepared = self._load_rows(gp.map_dir / "cave.txt", "cave.txt")
+        gp.reset_game(spawn_tile=None, prepared=prepared)
         gp._fade("in")
 
     def _exit_cave_to_house(self):
@@ -209,8 +244,8 @@ class EventHandler:
         gp._fade("out")
         self._in_cave = False
         self._in_interior = True
-        gp.raw_rows = load_map_file(gp.map_dir / "house.txt")
-        gp.reset_game(spawn_tile=(14, 6))
+        prepared = self._load_rows(gp.map_dir / "house.txt", "house.txt")
+        gp.reset_game(spawn_tile=(14, 6), prepared=prepared)
         # Restore persisted house object state.
         if self._saved_house_objects is not None:
             gp.world.objects = self._saved_house_objects
@@ -226,10 +261,11 @@ class EventHandler:
 
         gp._fade("out")
         gp.current_map_index = new_index
-        gp.raw_rows = load_map_file(gp.map_files[gp.current_map_index])
+        path = gp.map_files[gp.current_map_index]
+        prepared = self._load_rows(path, path.name)
 
         spawn_tile = None
         if spawn_on is not None:
             spawn_tile = gp._find_tile(spawn_on)
-        gp.reset_game(spawn_tile=spawn_tile)
+        gp.reset_game(spawn_tile=spawn_tile, prepared=prepared)
         gp._fade("in")
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathfinding import distance_field
+
+
+class FlowField:
+    """Shared "which way to the player" map for every chasing monster.
+
+    It holds the step distance from each open tile near the player to the player's
+    tile (a Dijkstra map). Monsters walk downhill with next_tile() instead of
+    running their own A*, so pathfinding costs one breadth-first search per player
+    tile change no matter how many monsters chase.
+
+    The search is limited to `radius` tiles around the player: the largest aggro
+    radius plus some room to walk around walls. Monsters outside it (or cut off)
+    get None and fall back to walking straight at the player, as they did when A*
+    found no path.
+    """
+
+    # Extra tiles searched past the largest aggro radius, for detours around walls.
+    DETOUR_TILES = 4
+
+    def __init__(self, radius: int = 0):
+        self.radius = radius
+        self.version = 0  # bumped whenever the field changes
+        self.builds = 0
+
+        self._goal = None
+        self._world = None
+        self._blocked_version = None
+        self._dist: dict[tuple[int, int], int] | None = None
+
+    def set_aggro_tiles(self, aggro_tiles: int):
+        radius = aggro_tiles + self.DETOUR_TILES
+        if radius != self.radius:
+            self.radius = radius
+            self._dist = None
+            self.version += 1
+
+    def retarget(self, goal: tuple[int, int], world):
+        """Point the field at `goal` on `world`. The search itself runs on the first query."""
+        if goal == self._goal and world is self._world and world.blocked_version == self._blocked_version:
+            return
+        self._goal = goal
+        self._world = world
+        self._blocked_version = world.blocked_version
+        self._dist = None
+        self.version += 1
+
+    def _field(self):
+        if self._dist is None:
+            world = self._world
+            self._dist = distance_field(self._goal, world.is_blocked_tile, world.w, world.h, self.radius)
+            self.builds += 1
+        return self._dist
+
+    def next_tile(self, tile: tuple[int, int]):
+        """The neighbouring tile one step closer to the goal, or None (at the goal / out of range)."""
+        if self._goal is None:
+            return None
+        dist = self._field()
+        best = None
+        best_d = dist.get(tile)
+        if best_d is None:
+            # Not on the field (e.g. standing on an inflated wall tile): any open neighbour on it will do.
+            best_d = 1 << 30
+        x, y = tile
+        # Same neighbour order as astar(), so ties resolve the same way.
+        for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            d = dist.get(n)
+            if d is not None and d < best_d:
+                best, best_d = n, d
+        return best
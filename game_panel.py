@@ -1,25 +1,55 @@
+import os
+import time
 from pathlib import Path
 
 import random
 
 import pygame
 
-from asset_setter import spawn_entities_from_map
+import assets
+from activity import ActivityTiers
+from asset_loader import AssetLoader
+from asset_pack import AssetPack
+from asset_setter import MONSTER_TYPES, spawn_entities_from_map
+from atlas import TextureAtlas
 from camera import Camera
+from dirty_renderer import DirtyRectRenderer
 from event_handler import EventHandler
-from key_handler import KeyHandler
+from flow_field import FlowField
+from key_handler import InputState, KeyHandler
 from map_loader import load_map_file
+from map_prefetcher import MapPrefetcher
+from monster import Monster
+from monster_batch import MonsterBatch
 from object_registry import ObjectRegistry
+from path_scheduler import PathScheduler
+from path_workers import PathWorkerPool
+from player import Player
+from profiler import FrameProfiler
 from sound_manager import SoundManager
+from spatial_hash import SpatialHash
 from tileset import TileSet
 from ui import UI
 from world_map import WorldMap
 
 
 class GamePanel:
-    def __init__(self, project_dir: Path):
+    def __init__(
+        self,
+        project_dir: Path,
+        dirty_rects: bool = False,
+        asset_pack: bool = True,
+        crossfade: bool = False,
+        headless: bool = False,
+    ):
         self.project_dir = project_dir
 
+        # Headless: no window, no audio device, injected input, no rendering (see simulate()).
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         pygame.init()
 
         base_tile = 16
@@ -33,6 +63,27 @@ class GamePanel:
         self.clock = pygame.time.Clock()
         self.ui = UI()
 
+        # Fixed-timestep simulation: update() always advances by sim_dt, at most max_sim_steps
+        # times per rendered frame. Rendering interpolates between the last two ticks and is
+        # capped at fps_cap (0 = as fast as the display allows).
+        self.sim_dt = 1 / 60
+        self.max_sim_steps = 5
+        self.fps_cap = 60
+        self._prev_positions: dict[int, tuple[float, float]] = {}
+        self._prev_camera: tuple[float, float] | None = None
+
+        # Phase timings of the last frames (F3 shows them, profile_csv saves them on exit).
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profile_csv: Path | None = None
+
+        # Optional dirty-rectangle presentation (redraw/update only what changed).
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects else None
+
+        # Map transitions fade through black, or crossfade between the old and new map.
+        self.crossfade = crossfade
+        self._fade_snapshot: pygame.Surface | None = None
+
         self.map_dir = self.project_dir / "maps"
         map_file = self.map_dir / "map.txt"
         if not map_file.exists():
@@ -47,11 +98,22 @@ class GamePanel:
         except StopIteration:
             self.current_map_index = 0
 
+        # Pre-scaled sprites: the memory-mapped asset pack (rebuilt automatically when sources change),
+        # then the texture atlas if one was built for this scale (python atlas.py --scale N).
+        if asset_pack:
+            assets.set_asset_pack(AssetPack.open(self.project_dir, self.display_scale))
+        assets.set_atlas(TextureAtlas.load(self.project_dir, self.display_scale))
+
         self.tileset = TileSet(self.project_dir / "tiles", self.display_scale)
-        self.object_registry = ObjectRegistry(self.project_dir, self.display_scale)
         self.raw_rows = load_map_file(self.map_files[self.current_map_index])
 
-        self.sound = SoundManager(self.project_dir / "sound")
+        # Decode everything the first map needs on a thread pool before building the game objects.
+        self.asset_loader = AssetLoader()
+        preloaded_sounds = self._preload_assets()
+
+        self.object_registry = ObjectRegistry(self.project_dir, self.display_scale)
+
+        self.sound = SoundManager(self.project_dir / "sound", preloaded=preloaded_sounds)
         self.sound.play_music()
 
         self.camera = Camera(self.screen_w, self.screen_h)
@@ -59,6 +121,14 @@ class GamePanel:
         self.world = None
         self.player = None
         self.monsters = []
+        # Monsters filed by tile, for the contact / push-out / attack / aggro checks near the player.
+        self.monster_hash = SpatialHash(self.tile_size)
+        self._max_aggro_px = 0
+        # Which monsters update each tick (every tick near the player / on screen, 5 Hz a bit
+        # further out, not at all far away). Set to None to update every monster every tick.
+        self.activity = ActivityTiers(self.tile_size)
+        # Optional NumPy struct-of-arrays monster state, see use_monster_batch().
+        self.monster_batch = None
         self.game_over = False
         self.paused = False
         self._gameover_sfx_played = False
@@ -72,18 +142,45 @@ class GamePanel:
 
         self._monster_drop_done: set[int] = set()
 
+        # Builds the maps reachable from the current one in the background.
+        self.prefetcher = MapPrefetcher(self.tile_size, self.tileset.solid_tiles, inflate_margin=1)
+
+        # One Dijkstra map toward the player, shared by every chasing monster.
+        # use_astar_chase() sets it to None to have each monster run (cached) A* instead,
+        # see WorldMap.find_path.
+        self.flow_field = FlowField()
+        # Without the flow field, monster A* searches are queued here and run within a
+        # per-tick node budget. Set to None to search directly in Monster.update().
+        self.path_scheduler = PathScheduler()
+
         # EventHandler owns all transition state and logic.
         self.events = EventHandler(self)
         
         # KeyHandler centralizes all keyboard input logic.
         self.key_handler = KeyHandler(self)
 
+        # Held keys come from pygame.key.get_pressed(), or from this injected state when headless.
+        self.input_state = InputState() if headless else None
+
         self.reset_game()
 
+    def _preload_assets(self):
+        loader = self.asset_loader
+        scale = self.display_scale
+        loader.add_images(self.tileset.paths_for("".join(self.raw_rows)), scale)
+        loader.add_images(ObjectRegistry.image_paths(self.project_dir).values(), scale)
+        loader.add_images(Player.image_paths(self.project_dir / "player"), scale)
+        for monster_type in MONSTER_TYPES:
+            for paths in Monster.frame_paths(self.project_dir / "monster", monster_type.sprite_name, scale).values():
+                loader.add_images(paths, scale)
+        for name in SoundManager.SFX_FILES.values():
+            loader.add_sound(self.project_dir / "sound" / name)
+        return loader.run()
+
     # ------------------------------------------------------------------
     # game state
     # ------------------------------------------------------------------
-    def reset_game(self, spawn_tile: tuple[int, int] | None = None):
+    def reset_game(self, spawn_tile: tuple[int, int] | None = None, prepared=None):
         # Save current player HP if player exists
         saved_hp = None
         if self.player is not None:
@@ -96,6 +193,10 @@ class GamePanel:
         else:
             map_name = self.map_files[self.current_map_index].name
 
+        # A map prepared by the prefetcher already has its layout and WorldMap built.
+        if prepared is not None and prepared.map_name != map_name:
+            prepared = None
+
         cleaned_rows, p, ms, objects = spawn_entities_from_map(
             self.project_dir,
             self.raw_rows,
@@ -103,9 +204,14 @@ class GamePanel:
             self.display_scale,
             map_name,
             spawn_tile=spawn_tile,
+            layout=prepared.layout if prepared is not None else None,
         )
-        self.world = WorldMap(cleaned_rows, self.tile_size, self.tileset.solid_tiles, inflate_margin=1, objects=objects)
+        if prepared is not None:
+            self.world = prepared.world
+        else:
+            self.world = WorldMap(cleaned_rows, self.tile_size, self.tileset.solid_tiles, inflate_margin=1, objects=objects)
         self.player = p
+        self.player.key_state = self.input_state
         
         # Restore player HP
         if saved_hp is not None:
@@ -113,6 +219,21 @@ class GamePanel:
         
         self.monsters = ms
         self._monster_drop_done = set()
+        self.monster_hash.clear()
+        for m in ms:
+            self.monster_hash.insert(m, m.rect)
+        self._max_aggro_px = max((m.aggro_radius_px for m in ms), default=0)
+        if self.activity is not None:
+            self.activity.reset(ms)
+        if self.monster_batch is not None:
+            self.monster_batch.reset(ms)
+        if self.flow_field is not None:
+            self.flow_field.set_aggro_tiles(max((m.aggro_radius_px // self.tile_size for m in ms), default=0))
+        if self.path_scheduler is not None:
+            self.path_scheduler.clear()
+        # New map: nothing to interpolate from.
+        self._prev_positions = {}
+        self._prev_camera = None
         self.game_over = False
         self.paused = False
         self._gameover_sfx_played = False
@@ -124,6 +245,9 @@ class GamePanel:
         else:
             self.sound.play_music()
 
+        # Start preparing the maps the player can reach from here.
+        self.prefetcher.prefetch(self.events.adjacent_maps())
+
     def full_restart_game(self):
         """Complete restart with full HP - used when pressing R after game over."""
         # Import here to avoid circular dependency
@@ -151,38 +275,65 @@ class GamePanel:
     # ------------------------------------------------------------------
     # helpers (used by EventHandler via self.gp)
     # ------------------------------------------------------------------
-    def _fade(self, mode: str, duration: float = 0.22):
-        if duration <= 0:
+    def _fade(self, mode: str, duration: float = 0.22, crossfade_duration: float = 0.44):
+        # The scene is rendered once into a snapshot and each fade step only composites
+        # an overlay on top of it:
+        # - "out": snapshot = the last rendered frame, overlay = black getting opaque.
+        # - "in": snapshot = the first frame of the new map, overlay = black getting transparent,
+        #   or, with crossfade, the outgoing snapshot getting transparent.
+        # A crossfade has no "out" step, so it runs for crossfade_duration instead of
+        # duration (by default as long as fading out and back in through black).
+        if duration <= 0 or self.headless:
             return
-        overlay = pygame.Surface((self.screen_w, self.screen_h))
-        overlay.fill((0, 0, 0))
-
-        t = 0.0
-        while t < duration:
-            dt = self.clock.tick(60) / 1000.0
-            t += dt
-            a = min(255, int(255 * (t / duration)))
-            if mode == "in":
-                a = 255 - a
-            overlay.set_alpha(a)
 
-            self.screen.fill((0, 0, 0))
-            if self.world is not None:
-                self.world.draw(self.screen, self.camera.offset, self.tileset, object_registry=self.object_registry)
-                for m in self.monsters:
-                    m.draw(self.screen, self.camera.offset)
+        # Fades run from inside a tick (usually the "player" phase); their own phase
+        # keeps the wait and compositing out of it.
+        with self.profiler.phase("fade"):
+            if mode == "out":
+                self._fade_snapshot = self.screen.copy()
+                if self.crossfade:
+                    # Nothing to animate yet: the "in" step blends from this snapshot.
+                    return
+                base = self._fade_snapshot
+                overlay = pygame.Surface((self.screen_w, self.screen_h))
+                overlay.fill((0, 0, 0))
+            else:
+                if self.world is not None and self.player is not None:
+                    self.camera.update(self.player.rect, self.world.pixel_width, self.world.pixel_height)
+                    self.draw_frame()
+                base = self.screen.copy()
+                if self.crossfade and self._fade_snapshot is not None:
+                    overlay = self._fade_snapshot
+                    duration = crossfade_duration
+                else:
+                    overlay = pygame.Surface((self.screen_w, self.screen_h))
+                    overlay.fill((0, 0, 0))
+                self._fade_snapshot = None
+
+            t = 0.0
+            while t < duration:
+                dt = self.clock.tick(60) / 1000.0
+                t += dt
+                # Keep the window responsive (events stay queued for the main loop).
+                pygame.event.pump()
+
+                a = min(255, int(255 * (t / duration)))
+                if mode == "in":
+                    a = 255 - a
+                overlay.set_alpha(a)
+
+                self.screen.blit(base, (0, 0))
+                self.screen.blit(overlay, (0, 0))
+                pygame.display.flip()
 
-                if self.player is not None:
-                    px, py = self.player.get_draw_pos()
-                    pimg = self.player.get_draw_image()
-                    if pimg is not None:
-                        self.screen.blit(
-                            pimg,
-                            (px - int(self.camera.offset.x), py - int(self.camera.offset.y)),
-                        )
+            if mode == "in":
+                # Leave the screen as the clean new frame (the dirty-rect renderer builds on it).
+                overlay.set_alpha(None)
+                self.screen.blit(base, (0, 0))
 
-            self.screen.blit(overlay, (0, 0))
-            pygame.display.flip()
+            # The fade drew over everything, so the next dirty-rect frame must be a full one.
+            if self.renderer is not None:
+                self.renderer.force_full()
 
     def _adjacent_object_tile(self, valid: set[str]):
         tile = self._tile_under_player()
@@ -274,29 +425,102 @@ class GamePanel:
             self._monster_drop_done.add(mid)
 
     # ------------------------------------------------------------------
-    # main loop
+    # rendering
     # ------------------------------------------------------------------
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(60) / 1000.0
+    def draw_scene(self):
+        # World, monsters and player (no UI).
+        with self.profiler.phase("world_draw"):
+            self.world.draw(self.screen, self.camera.offset, self.tileset, object_registry=self.object_registry)
 
-            # ------------------------------------------------------------------
-            # Event handling - now delegated to KeyHandler
-            # ------------------------------------------------------------------
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    # Delegate all keyboard input to the KeyHandler
-                    should_quit = self.key_handler.handle_keydown(event.key)
-                    if should_quit:
-                        running = False
+        with self.profiler.phase("entity_draw"):
+            for m in self.monsters:
+                m.draw(self.screen, self.camera.offset)
+            self._draw_player()
 
-            # ------------------------------------------------------------------
-            # Game update logic
-            # ------------------------------------------------------------------
-            if not self.game_over and not self.paused and not self.inventory_open:
+    def _draw_player(self):
+        if self.player is not None:
+            px, py = self.player.get_draw_pos()
+            pimg = self.player.get_draw_image()
+            if pimg is not None:
+                self.screen.blit(
+                    pimg,
+                    (px - int(self.camera.offset.x), py - int(self.camera.offset.y)),
+                )
+
+    def draw_frame(self, areas=None, monster_rects=None):
+        """Draw the frame to self.screen.
+
+        The dirty-rect renderer passes `areas` (non-overlapping screen rects) to redraw
+        only those, each clipped to itself, and `monster_rects` (each monster's screen
+        draw rect, in self.monsters order): an area only blits the chunks and monsters
+        under it.
+        """
+        if areas is None:
+            with self.profiler.phase("world_draw"):
+                self.screen.fill((0, 0, 0))
+            self.draw_scene()
+
+            with self.profiler.phase("ui"):
+                self._draw_ui()
+            return
+
+        screen = self.screen
+        offset = self.camera.offset
+        # Screen area the map covers; only the rest needs the black background.
+        world_rect = pygame.Rect(-int(offset.x), -int(offset.y), self.world.pixel_width, self.world.pixel_height)
+        # Layer by layer over all areas; they don't overlap, so each one still gets world, then
+        # entities, then UI.
+        with self.profiler.phase("world_draw"):
+            for area in areas:
+                screen.set_clip(area)
+                if not world_rect.contains(area):
+                    screen.fill((0, 0, 0), area)
+                self.world.draw(screen, offset, self.tileset, object_registry=self.object_registry, area=area)
+
+        with self.profiler.phase("entity_draw"):
+            player_rect = None
+            if self.player is not None:
+                player_rect = self.player.get_draw_rect().move(-int(offset.x), -int(offset.y))
+            for area in areas:
+                screen.set_clip(area)
+                for m, r in zip(self.monsters, monster_rects):
+                    if r.colliderect(area):
+                        m.draw(screen, offset)
+                if player_rect is not None and player_rect.colliderect(area):
+                    self._draw_player()
+
+        with self.profiler.phase("ui"):
+            for area in areas:
+                screen.set_clip(area)
+                self._draw_ui()
+        screen.set_clip(None)
+
+    def _draw_ui(self):
+        self.ui.draw(
+            self.screen,
+            self.screen_w,
+            self.screen_h,
+            player_hp=self.player.hp,
+            player_max_hp=self.player.max_hp,
+            paused=self.paused,
+            game_over=self.game_over,
+            inventory_open=self.inventory_open,
+            inventory=self.inventory,
+            victory=self.victory,
+            monsters_killed=self.monsters_killed,
+            coins_collected=self.total_coins_collected,
+        )
+        if self.show_profiler:
+            self.profiler.draw(self.screen)
+
+    # ------------------------------------------------------------------
+    # main loop
+    # ------------------------------------------------------------------
+    def update(self, dt: float):
+        # One simulation tick: player, monsters, combat, pickups, transitions and drops.
+        prof = self.profiler
+        if not self.game_over and not self.paused and not self.inventory_open:
+            with prof.phase("player"):
                 self.player.update(dt, self.world.colliders_for_rect)
                 self.camera.update(self.player.rect, self.world.pixel_width, self.world.pixel_height)
 
@@ -306,18 +530,71 @@ class GamePanel:
                 self.events.update()
                 self.events.flush_pending()
 
-                for m in self.monsters:
-                    m.update(dt, self.player.rect, self.world.colliders_for_rect, self.world.w, self.world.h, self.world.is_blocked_tile)
-
-                for m in self.monsters:
-                    if m.is_dying():
-                        continue
-                    dist = pygame.Vector2(m.rect.center).distance_to(self.player.rect.center)
-                    if dist <= self.tile_size * 0.75:
-                        if self.player.take_damage(1):
-                            self.sound.play_damage()
-
-                for m in self.monsters:
+            with prof.phase("monsters"):
+                if self.flow_field is not None:
+                    player_tile = (self.player.rect.centerx // self.tile_size, self.player.rect.centery // self.tile_size)
+                    self.flow_field.retarget(player_tile, self.world)
+                ts = self.tile_size
+                ox, oy = int(self.camera.offset.x), int(self.camera.offset.y)
+                scheduler = self.path_scheduler if self.flow_field is None else None
+                if scheduler is not None:
+                    scheduler.set_view(ox // ts, oy // ts, (ox + self.screen_w) // ts, (oy + self.screen_h) // ts)
+                monster_hash = self.monster_hash
+
+                def run_monster(m, m_dt=dt, near_player=True):
+                    m.update(
+                        m_dt,
+                        self.player.rect,
+                        self.world.colliders_for_rect,
+                        self.world.w,
+                        self.world.h,
+                        self.world.is_blocked_tile,
+                        flow_field=self.flow_field,
+                        find_path=self.world.find_path,
+                        path_scheduler=scheduler,
+                        near_player=near_player,
+                    )
+
+                if self.monster_batch is not None:
+                    # Array passes for everyone, Monster.update() only where it's needed.
+                    for m in self.monster_batch.update(dt, self.player.rect, self.world, ts, run_monster):
+                        monster_hash.move(m, m.rect)
+                    prof.count("monsters_full_update", self.monster_batch.full_updates)
+                else:
+                    if self.activity is not None:
+                        view = pygame.Rect(ox, oy, self.screen_w, self.screen_h)
+                        selected = self.activity.select(dt, monster_hash, len(self.monsters), self.player.rect, view)
+                        for tier, n in self.activity.counts.items():
+                            prof.count(f"monsters_{tier}", n)
+                    else:
+                        selected = [(m, dt) for m in self.monsters]
+                    # Monsters outside every cell near the player can't be in aggro range.
+                    near = set(monster_hash.query_radius(self.player.rect.center, self._max_aggro_px))
+                    for m, m_dt in selected:
+                        run_monster(m, m_dt, m in near)
+                        monster_hash.move(m, m.rect)
+                if scheduler is not None:
+                    scheduler.run(self.world)
+
+            with prof.phase("contact"):
+                contact_px = self.tile_size * 0.75
+                if self.monster_batch is not None:
+                    touching = self.monster_batch.in_contact(self.player.rect.center, contact_px)
+                else:
+                    touching = [
+                        m
+                        for m in self.monster_hash.query_radius(self.player.rect.center, contact_px)
+                        if not m.is_dying()
+                        and pygame.Vector2(m.rect.center).distance_to(self.player.rect.center) <= contact_px
+                    ]
+                for m in touching:
+                    if self.player.take_damage(1):
+                        self.sound.play_damage()
+
+                # Each push moves the player a few pixels, so a tile of margin covers every
+                # monster the (moving) player rect can reach during this loop.
+                margin = self.tile_size * 2
+                for m in self.monster_hash.query_rect(self.player.rect.inflate(margin, margin)):
                     if m.is_dying():
                         continue
                     if self.player.rect.colliderect(m.rect):
@@ -332,26 +609,28 @@ class GamePanel:
                                     self.player.rect.topleft = (int(self.player.pos.x), int(self.player.pos.y))
                                     break
 
-                if not self.player.is_alive():
-                    self.game_over = True
-                    self.paused = False
-                    if not self._gameover_sfx_played:
-                        self.sound.stop_music()
-                        self.sound.play_gameover()
-                        self._gameover_sfx_played = True
+            if not self.player.is_alive():
+                self.game_over = True
+                self.paused = False
+                if not self._gameover_sfx_played:
+                    self.sound.stop_music()
+                    self.sound.play_gameover()
+                    self._gameover_sfx_played = True
 
-            # Drops are spawned once monsters finish dying.
+        # Drops are spawned once monsters finish dying.
+        with prof.phase("drops"):
             self._try_spawn_monster_drops()
 
-            if (
-                not self.game_over
-                and not self.paused
-                and not self.inventory_open
-                and self.player.attack_hitbox_active()
-                and not self.player.attack_damage_applied
-            ):
+        if (
+            not self.game_over
+            and not self.paused
+            and not self.inventory_open
+            and self.player.attack_hitbox_active()
+            and not self.player.attack_damage_applied
+        ):
+            with prof.phase("contact"):
                 hitbox = self.player.get_attack_hitbox()
-                for m in self.monsters:
+                for m in self.monster_hash.query_rect(hitbox):
                     if hitbox.colliderect(m.rect):
                         if m.take_damage(1):
                             knock_dir = pygame.Vector2(m.rect.center) - pygame.Vector2(self.player.rect.center)
@@ -359,44 +638,164 @@ class GamePanel:
                             self.sound.play_hitmonster()
                 self.player.attack_damage_applied = True
 
-            if not self.paused:
+        if not self.paused:
+            with prof.phase("drops"):
                 before_count = len(self.monsters)
+                for m in self.monsters:
+                    if m.is_dead():
+                        self.monster_hash.remove(m)
+                        if self.activity is not None:
+                            self.activity.remove(m)
+                        if self.monster_batch is not None:
+                            self.monster_batch.remove(m)
+                        if self.path_scheduler is not None:
+                            self.path_scheduler.cancel(m)
                 self.monsters = [m for m in self.monsters if not m.is_dead()]
                 after_count = len(self.monsters)
                 self.monsters_killed += (before_count - after_count)
 
-            # ------------------------------------------------------------------
-            # Rendering
-            # ------------------------------------------------------------------
-            self.screen.fill((0, 0, 0))
-            self.world.draw(self.screen, self.camera.offset, self.tileset, object_registry=self.object_registry)
+    # ------------------------------------------------------------------
+    # render interpolation
+    # ------------------------------------------------------------------
+    def _store_previous_positions(self):
+        self._prev_positions = {id(m): m.rect.topleft for m in self.monsters}
+        self._prev_positions[id(self.player)] = self.player.rect.topleft
+        self._prev_camera = (self.camera.offset.x, self.camera.offset.y)
+
+    def _apply_interpolation(self, alpha: float):
+        """Move rects/camera to alpha between the previous and current tick. Returns what to restore."""
+        restore = []
+        max_jump = self.tile_size
+        for e in [self.player, *self.monsters]:
+            prev = self._prev_positions.get(id(e))
+            if prev is None:
+                continue
+            cur = e.rect.topleft
+            # Don't interpolate teleports (spawns, transitions).
+            if abs(cur[0] - prev[0]) > max_jump or abs(cur[1] - prev[1]) > max_jump:
+                continue
+            restore.append((e.rect, cur))
+            e.rect.topleft = (
+                round(prev[0] + (cur[0] - prev[0]) * alpha),
+                round(prev[1] + (cur[1] - prev[1]) * alpha),
+            )
 
-            for m in self.monsters:
-                m.draw(self.screen, self.camera.offset)
+        camera = (self.camera.offset.x, self.camera.offset.y)
+        if self._prev_camera is not None:
+            px, py = self._prev_camera
+            if abs(camera[0] - px) <= max_jump and abs(camera[1] - py) <= max_jump:
+                self.camera.offset.update(round(px + (camera[0] - px) * alpha), round(py + (camera[1] - py) * alpha))
+        return restore, camera
+
+    def _restore_interpolation(self, saved):
+        restore, camera = saved
+        for rect, pos in restore:
+            rect.topleft = pos
+        self.camera.offset.update(camera)
+
+    def present(self, alpha: float = 1.0):
+        """Render and show a frame, `alpha` of the way from the previous tick to the current one."""
+        saved = self._apply_interpolation(alpha) if alpha < 1.0 else None
+        try:
+            if self.renderer is not None:
+                self.renderer.present(self)
+            else:
+                self.draw_frame()
+                with self.profiler.phase("present"):
+                    pygame.display.flip()
+        finally:
+            if saved is not None:
+                self._restore_interpolation(saved)
+
+    def press(self, key: int) -> bool:
+        """Inject a KEYDOWN (headless input). Returns True if the key asks to quit."""
+        return self.key_handler.handle_keydown(key)
+
+    def simulate(self, ticks: int, dt: float = 1 / 60, script=None):
+        """Step the simulation `ticks` times as fast as possible: no rendering, no frame pacing.
+
+        `script(gp, tick)` is called before every tick to inject input, either held keys
+        through `gp.input_state` or key presses through `gp.press(key)`.
+        Returns {"ticks", "seconds", "ticks_per_second"}.
+        """
+        t0 = time.perf_counter()
+        for tick in range(ticks):
+            if script is not None:
+                script(self, tick)
+            self.update(dt)
+            self.profiler.end_frame()
+        elapsed = time.perf_counter() - t0
+        return {
+            "ticks": ticks,
+            "seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else float("inf"),
+        }
+
+    def use_monster_batch(self):
+        """Keep monster state in NumPy arrays and update it in bulk (needs NumPy).
+
+        The batch advances every monster each tick, so activity tiers are switched off.
+        """
+        self.activity = None
+        self.monster_batch = MonsterBatch(self.monsters)
+
+    def use_astar_chase(self):
+        """Chase with per-monster A* queued in the frame-budgeted PathScheduler instead of the flow field."""
+        self.flow_field = None
+        if self.path_scheduler is None:
+            self.path_scheduler = PathScheduler()
+
+    def use_path_workers(self, workers: int | None = None):
+        """Chase with per-monster A* searched in worker processes instead of the flow field."""
+        if self.path_scheduler is not None:
+            self.path_scheduler.shutdown()
+        self.flow_field = None
+        self.path_scheduler = PathWorkerPool(workers)
+
+    def quit(self):
+        if self.profile_csv is not None:
+            self.profiler.dump_csv(self.profile_csv)
+        self.prefetcher.shutdown()
+        if self.path_scheduler is not None:
+            self.path_scheduler.shutdown()
+        pygame.quit()
 
-            px, py = self.player.get_draw_pos()
-            pimg = self.player.get_draw_image()
-            if pimg is not None:
-                self.screen.blit(
-                    pimg,
-                    (px - int(self.camera.offset.x), py - int(self.camera.offset.y)),
-                )
+    def run(self):
+        running = True
+        accumulator = 0.0
+        while running:
+            accumulator += self.clock.tick(self.fps_cap) / 1000.0
 
-            self.ui.draw(
-                self.screen,
-                self.screen_w,
-                self.screen_h,
-                player_hp=self.player.hp,
-                player_max_hp=self.player.max_hp,
-                paused=self.paused,
-                game_over=self.game_over,
-                inventory_open=self.inventory_open,
-                inventory=self.inventory,
-                victory=self.victory,
-                monsters_killed=self.monsters_killed,
-                coins_collected=self.total_coins_collected,
-            )
+            # ------------------------------------------------------------------
+            # Event handling - now delegated to KeyHandler
+            # ------------------------------------------------------------------
+            with self.profiler.phase("input"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.KEYDOWN:
+                        # Delegate all keyboard input to the KeyHandler
+                        should_quit = self.key_handler.handle_keydown(event.key)
+                        if should_quit:
+                            running = False
 
-            pygame.display.flip()
+            # ------------------------------------------------------------------
+            # Game update logic (fixed timestep)
+            # ------------------------------------------------------------------
+            steps = 0
+            while accumulator >= self.sim_dt and steps < self.max_sim_steps:
+                self._store_previous_positions()
+                self.update(self.sim_dt)
+                accumulator -= self.sim_dt
+                steps += 1
+            if steps == self.max_sim_steps:
+                # Too far behind (e.g. after a fade): drop the backlog instead of fast-forwarding.
+                accumulator = min(accumulator, self.sim_dt)
+
+            # ------------------------------------------------------------------
+            # Rendering
+            # ------------------------------------------------------------------
+            self.present(min(1.0, accumulator / self.sim_dt))
+            self.profiler.end_frame()
 
-        pygame.quit()
\ No newline at end of file
+        self.quit()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Headless simulation helpers (no window, no audio device, no frame pacing).
+
+Used for throughput benchmarks, soak tests and batch balancing runs:
+
+    python main.py --headless 20000 --seed 1
+"""
+
+from __future__ import annotations
+
+import random
+
+import pygame
+
+
+MOVE_CHOICES = [
+    set(),
+    {pygame.K_w},
+    {pygame.K_s},
+    {pygame.K_a},
+    {pygame.K_d},
+    {pygame.K_w, pygame.K_d},
+    {pygame.K_s, pygame.K_a},
+    {pygame.K_d, pygame.K_LSHIFT},
+]
+
+
+def random_input_script(seed: int | None = None, change_every: int = 45, action_chance: float = 0.03):
+    """Input script for GamePanel.simulate(): wander around, attack and interact at random.
+
+    Restarts the game when it ends so long soak runs keep exercising the simulation.
+    """
+    rng = random.Random(seed)
+
+    def script(gp, tick: int):
+        if gp.game_over:
+            gp.press(pygame.K_r)
+            return
+        if tick % change_every == 0:
+            gp.input_state.set_pressed(rng.choice(MOVE_CHOICES))
+        if rng.random() < action_chance:
+            gp.press(pygame.K_SPACE)
+        if rng.random() < action_chance:
+            gp.press(pygame.K_x)
+        if rng.random() < action_chance / 4:
+            gp.press(pygame.K_1)
+
+    return script
+
+
+def run_headless(
+    project_dir,
+    ticks: int,
+    seed: int | None = None,
+    dt: float = 1 / 60,
+    monster_batch: bool = False,
+    astar_chase: bool = False,
+    path_workers: int | None = None,
+):
+    """Build a headless GamePanel, simulate `ticks` ticks with random input and return the stats."""
+    from game_panel import GamePanel
+
+    gp = GamePanel(project_dir, headless=True)
+    try:
+        if monster_batch:
+            gp.use_monster_batch()
+        if astar_chase:
+            gp.use_astar_chase()
+        if path_workers is not None:
+            # 0 = one worker per CPU, like --path-workers.
+            gp.use_path_workers(path_workers or None)
+        stats = gp.simulate(ticks, dt=dt, script=random_input_script(seed))
+        stats["monsters_killed"] = gp.monsters_killed
+        stats["coins_collected"] = gp.total_coins_collected
+        stats["player_hp"] = gp.player.hp
+    finally:
+        # Also shuts the path worker pool down.
+        gp.quit()
+    return stats
@@ -0,0 +1,291 @@
+"""Hierarchical pathfinding (HPA*) over a BlockedGrid.
+
+The grid is cut into square clusters. Where two neighbouring clusters share a
+run of open tiles along their border, one or two entrances are placed on it;
+each entrance is a pair of abstract nodes (one tile on each side, one step
+apart). Inside a cluster, abstract nodes are linked by their walking distance,
+found by a breadth-first search that stays in the cluster.
+
+A query links start and goal to the abstract nodes of their clusters, runs A*
+on that small graph, and then refines only the first part of the result: the
+returned tile path ends one step into the next cluster. Monsters walk it and
+ask again, so long routes cost a search over clusters instead of tiles.
+
+Paths are not always the shortest, since routes go through entrance tiles: on a
+150x150 maze they were about 1% longer at the median and under 10% longer for
+nine in ten paths, but a few were up to ~45% longer.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+
+from pathfinding import BlockedGrid
+
+
+class HierarchicalPathfinder:
+    # Runs of open border tiles at least this long get an entrance at both ends.
+    WIDE_ENTRANCE = 6
+
+    def __init__(self, grid: BlockedGrid, cluster_size: int = 16):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cols = (grid.w + cluster_size - 1) // cluster_size
+        self.rows = (grid.h + cluster_size - 1) // cluster_size
+
+        # (cluster, neighbour cluster to the right/below) -> [(node, node), ...] entrance pairs.
+        self._borders: dict[tuple[tuple[int, int], tuple[int, int]], list[tuple[int, int]]] = {}
+        # Abstract nodes (cell indices) of each cluster, and their links.
+        self._nodes: dict[tuple[int, int], set[int]] = {}
+        self._inter: dict[int, dict[int, int]] = {}
+        self._intra: dict[int, dict[int, int]] = {}
+        # Clusters whose intra-cluster distances are up to date (they're computed on demand).
+        self._intra_ready: set[tuple[int, int]] = set()
+
+        self.searches = 0
+        self.cluster_builds = 0
+
+        for cx in range(self.cols):
+            for cy in range(self.rows):
+                if cx + 1 < self.cols:
+                    self._build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.rows:
+                    self._build_border((cx, cy), (cx, cy + 1))
+
+    # ------------------------------------------------------------------
+    # clusters and entrances
+    # ------------------------------------------------------------------
+    def cluster_of(self, i: int):
+        h = self.grid.h
+        return (i // h) // self.cluster_size, (i % h) // self.cluster_size
+
+    def _bounds(self, cluster: tuple[int, int]):
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return x0, y0, min(self.grid.w, x0 + cs) - 1, min(self.grid.h, y0 + cs) - 1
+
+    def _build_border(self, a: tuple[int, int], b: tuple[int, int]):
+        # Entrance pairs along the border between cluster a and its right/lower neighbour b.
+        cells = self.grid.cells
+        h = self.grid.h
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+        if b[0] != a[0]:
+            # a | b: pairs (ax1, y) - (ax1 + 1, y)
+            pairs = [((ax1 * h + y), ((ax1 + 1) * h + y)) for y in range(ay0, ay1 + 1)]
+        else:
+            # a over b: pairs (x, ay1) - (x, ay1 + 1)
+            pairs = [((x * h + ay1), (x * h + ay1 + 1)) for x in range(ax0, ax1 + 1)]
+
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not cells[pair[0]] and not cells[pair[1]]:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= self.WIDE_ENTRANCE:
+                    entrances.extend((run[0], run[-1]))
+                else:
+                    entrances.append(run[len(run) // 2])
+                run = []
+
+        old = self._borders.get((a, b), [])
+        for na, nb in old:
+            self._inter.get(na, {}).pop(nb, None)
+            self._inter.get(nb, {}).pop(na, None)
+        self._borders[(a, b)] = entrances
+        for na, nb in entrances:
+            self._inter.setdefault(na, {})[nb] = 1
+            self._inter.setdefault(nb, {})[na] = 1
+
+    def _refresh_nodes(self, cluster: tuple[int, int]):
+        cx, cy = cluster
+        nodes = set()
+        for key, first in (
+            (((cx - 1, cy), cluster), 1),
+            ((cluster, (cx + 1, cy)), 0),
+            (((cx, cy - 1), cluster), 1),
+            ((cluster, (cx, cy + 1)), 0),
+        ):
+            for pair in self._borders.get(key, ()):
+                nodes.add(pair[first])
+        for node in self._nodes.get(cluster, set()) - nodes:
+            self._inter.pop(node, None)
+            self._intra.pop(node, None)
+        self._nodes[cluster] = nodes
+        self._intra_ready.discard(cluster)
+
+    def _bfs(self, src: int, cluster: tuple[int, int]):
+        # Step distances (and parents) from cell src to the open cells of `cluster`, staying inside it.
+        cells = self.grid.cells
+        h = self.grid.h
+        x0, y0, x1, y1 = self._bounds(cluster)
+        dist = {src: 0}
+        parent = {}
+        queue = deque([src])
+        while queue:
+            i = queue.popleft()
+            x, y = divmod(i, h)
+            nd = dist[i] + 1
+            for n, ok in ((i + h, x < x1), (i - h, x > x0), (i + 1, y < y1), (i - 1, y > y0)):
+                if ok and n not in dist and not cells[n]:
+                    dist[n] = nd
+                    parent[n] = i
+                    queue.append(n)
+        return dist, parent
+
+    def _intra_links(self, node: int):
+        cluster = self.cluster_of(node)
+        if cluster not in self._intra_ready:
+            if cluster not in self._nodes:
+                self._refresh_nodes(cluster)
+            nodes = self._nodes[cluster]
+            for n in nodes:
+                dist, _ = self._bfs(n, cluster)
+                self._intra[n] = {m: dist[m] for m in nodes if m != n and m in dist}
+            self._intra_ready.add(cluster)
+            self.cluster_builds += 1
+        return self._intra.get(node, {})
+
+    def update_cells(self, changed):
+        """Re-link after the cells at indices `changed` flipped between open and blocked.
+
+        Only the clusters containing them are touched: their borders are rebuilt
+        if a changed cell lies on one, and their inner distances are recomputed
+        the next time a search needs them.
+        """
+        cs = self.cluster_size
+        h = self.grid.h
+        stale = set()
+        borders = set()
+        for i in changed:
+            x, y = divmod(i, h)
+            cluster = (x // cs, y // cs)
+            stale.add(cluster)
+            x0, y0, x1, y1 = self._bounds(cluster)
+            cx, cy = cluster
+            if x == x0 and cx > 0:
+                borders.add(((cx - 1, cy), cluster))
+            if x == x1 and cx + 1 < self.cols:
+                borders.add((cluster, (cx + 1, cy)))
+            if y == y0 and cy > 0:
+                borders.add(((cx, cy - 1), cluster))
+            if y == y1 and cy + 1 < self.rows:
+                borders.add((cluster, (cx, cy + 1)))
+        for a, b in borders:
+            self._build_border(a, b)
+            stale.update((a, b))
+        for cluster in stale:
+            self._refresh_nodes(cluster)
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+    def find_path(self, start, goal, max_nodes: int = 20000):
+        """Tiles from start towards goal (excluding start), ending one step into the next cluster.
+
+        The whole path is returned when start and goal share a cluster and can reach
+        each other inside it. Returns [] when there is no route (or the abstract
+        search runs past max_nodes).
+        """
+        grid = self.grid
+        w, h = grid.w, grid.h
+        if start == goal:
+            return []
+        sx, sy = start
+        gx, gy = goal
+        if not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h):
+            return []
+        start_i = sx * h + sy
+        goal_i = gx * h + gy
+        if grid.cells[goal_i]:
+            return []
+        self.searches += 1
+
+        start_cluster = self.cluster_of(start_i)
+        goal_cluster = self.cluster_of(goal_i)
+        for cluster in (start_cluster, goal_cluster):
+            if cluster not in self._nodes:
+                self._refresh_nodes(cluster)
+
+        start_dist, start_parent = self._bfs(start_i, start_cluster)
+        if goal_cluster == start_cluster and goal_i in start_dist:
+            return self._walk(start_i, goal_i, start_parent)
+
+        goal_dist, _ = self._bfs(goal_i, goal_cluster)
+        goal_links = {n: d for n, d in goal_dist.items() if n in self._nodes[goal_cluster]}
+        start_links = {n: d for n, d in start_dist.items() if n in self._nodes[start_cluster]}
+        if not start_links and grid.cells[start_i]:
+            # Standing on a blocked tile at the cluster's edge: like astar(), step off it,
+            # here into the neighbouring cluster.
+            for nx, ny in ((sx + 1, sy), (sx - 1, sy), (sx, sy + 1), (sx, sy - 1)):
+                if not (0 <= nx < w and 0 <= ny < h) or grid.cells[nx * h + ny]:
+                    continue
+                if self.cluster_of(nx * h + ny) == start_cluster:
+                    continue
+                rest = [] if (nx, ny) == goal else self.find_path((nx, ny), goal, max_nodes)
+                if rest or (nx, ny) == goal:
+                    return [(nx, ny)] + rest
+            return []
+        if not goal_links or not start_links:
+            return []
+
+        # A* over the abstract graph (start -> entrance nodes -> goal).
+        def h_cost(i):
+            return abs(i // h - gx) + abs(i % h - gy)
+
+        g_score = {start_i: 0}
+        came_from = {}
+        open_heap = [(h_cost(start_i), 0, start_i)]
+        expanded = 0
+        while open_heap and expanded < max_nodes:
+            _, g, node = heapq.heappop(open_heap)
+            if g > g_score.get(node, g):
+                continue
+            if node == goal_i:
+                return self._refine(start_i, start_cluster, start_parent, came_from, goal_i)
+            expanded += 1
+
+            if node == start_i:
+                links = list(start_links.items()) + list(self._inter.get(node, {}).items())
+            else:
+                links = list(self._intra_links(node).items()) + list(self._inter.get(node, {}).items())
+                if node in goal_links:
+                    links.append((goal_i, goal_links[node]))
+            for n, cost in links:
+                ng = g + cost
+                if ng < g_score.get(n, 1 << 60):
+                    g_score[n] = ng
+                    came_from[n] = node
+                    heapq.heappush(open_heap, (ng + h_cost(n), ng, n))
+        return []
+
+    def _walk(self, src: int, dst: int, parent: dict[int, int]):
+        h = self.grid.h
+        path = []
+        i = dst
+        while i != src:
+            path.append(divmod(i, h))
+            i = parent[i]
+        path.reverse()
+        return path
+
+    def _refine(self, start_i, start_cluster, start_parent, came_from, goal_i):
+        # Abstract route start -> ... -> goal; turn its first leg into tiles, up to and
+        # including the first tile outside the start cluster.
+        route = [goal_i]
+        while route[-1] != start_i:
+            route.append(came_from[route[-1]])
+        route.reverse()
+
+        h = self.grid.h
+        path = []
+        for a, b in zip(route, route[1:]):
+            if self.cluster_of(b) != start_cluster:
+                # Entrance link: one step into the neighbouring cluster.
+                path.append(divmod(b, h))
+                break
+            parent = start_parent if a == start_i else self._bfs(a, start_cluster)[1]
+            path.extend(self._walk(a, b, parent))
+        return path
@@ -22,6 +22,7 @@ class KeyAction:
     QUIT = "quit"
     PAUSE = "pause"
     RESTART = "restart"
+    TOGGLE_PROFILER = "toggle_profiler"
     
     # Inventory controls
     TOGGLE_INVENTORY = "toggle_inventory"
@@ -50,6 +51,7 @@ class KeyBindings:
         self.quit_keys = {pygame.K_ESCAPE}
         self.pause_keys = {pygame.K_p}
         self.restart_keys = {pygame.K_r}
+        self.profiler_keys = {pygame.K_F3}
         
         # Inventory controls
         self.inventory_toggle_keys = {pygame.K_e}
@@ -77,6 +79,8 @@ class KeyBindings:
             return KeyAction.PAUSE
         if key in self.restart_keys:
             return KeyAction.RESTART
+        if key in self.profiler_keys:
+            return KeyAction.TOGGLE_PROFILER
         if key in self.inventory_toggle_keys:
             return KeyAction.TOGGLE_INVENTORY
         if key in self.use_potion_keys:
@@ -129,6 +133,8 @@ class KeyHandler:
             self._handle_pause()
         elif action == KeyAction.RESTART:
             self._handle_restart()
+        elif action == KeyAction.TOGGLE_PROFILER:
+            self._handle_profiler_toggle()
         elif action == KeyAction.TOGGLE_INVENTORY:
             self._handle_inventory_toggle()
         elif action == KeyAction.USE_POTION:
@@ -161,6 +167,10 @@ class KeyHandler:
         # Use the full restart function which resets HP to full
         self.gp.full_restart_game()
     
+    def _handle_profiler_toggle(self) -> None:
+        """Handle frame profiler overlay toggle (F3 key)."""
+        self.gp.show_profiler = not self.gp.show_profiler
+    
     # ------------------------------------------------------------------
     # Inventory control handlers
     # ------------------------------------------------------------------
@@ -233,7 +243,7 @@ class KeyHandler:
             "movement": "WASD/Arrows move | Shift run",
             "actions": "Space attack | X interact",
             "inventory": "E inventory | 1 use potion",
-            "system": "P pause | R restart | Esc quit",
+            "system": "P pause | R restart | F3 profiler | Esc quit",
         }
     
     def is_movement_key(self, key: int) -> bool:
@@ -255,8 +265,8 @@ class InputState:
     Optional: Track the current state of all inputs for query-based input handling.
     This is useful for continuous actions (like movement) vs discrete actions (like attack).
     
-    Currently movement is handled in player.py using pygame.key.get_pressed(),
-    but this class provides an alternative approach if needed.
+    Movement is handled in player.py using pygame.key.get_pressed(); an InputState
+    can stand in for it (`player.key_state`) to inject input, e.g. in headless runs.
     """
     
     def __init__(self):
@@ -276,4 +286,12 @@ class InputState:
     
     def any_pressed(self, keys: set[int]) -> bool:
         """Check if any key in a set is pressed."""
-        return bool(self.pressed_keys & keys)
\ No newline at end of file
+        return bool(self.pressed_keys & keys)
+    
+    def set_pressed(self, keys) -> None:
+        """Replace the held keys (injected input)."""
+        self.pressed_keys = set(keys)
+    
+    def __getitem__(self, key: int) -> bool:
+        """Index like the sequence returned by pygame.key.get_pressed()."""
+        return key in self.pressed_keys
@@ -1,14 +1,105 @@
+import argparse
 from pathlib import Path
 
 from game_panel import GamePanel
+from headless import run_headless
 
 
 PROJECT_DIR = Path(__file__).resolve().parent
 
 
 def main():
-    GamePanel(PROJECT_DIR).run()
+    parser = argparse.ArgumentParser(description="Endless Dungeons")
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="only redraw and present the screen regions that changed (faster on slow displays)",
+    )
+    parser.add_argument(
+        "--no-asset-pack",
+        action="store_true",
+        help="load sprites from the PNG files instead of the pre-scaled asset pack",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=60,
+        help="render frame-rate cap, 0 = uncapped (the simulation always runs at 60 Hz)",
+    )
+    parser.add_argument(
+        "--crossfade",
+        action="store_true",
+        help="crossfade between maps instead of fading through black",
+    )
+    parser.add_argument(
+        "--headless",
+        type=int,
+        metavar="TICKS",
+        help="run TICKS simulation ticks without a window or audio (random input) and print throughput",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="random seed for --headless runs")
+    parser.add_argument(
+        "--profile-csv",
+        type=Path,
+        metavar="PATH",
+        help="write the per-frame phase timings (F3 overlay) to a CSV file on exit",
+    )
+    parser.add_argument(
+        "--astar-chase",
+        action="store_true",
+        help="chase with per-monster A* searched within a per-frame node budget instead of the flow field",
+    )
+    parser.add_argument(
+        "--path-workers",
+        type=int,
+        metavar="N",
+        help="chase with per-monster A* run in N worker processes (0 = one per CPU) instead of the flow field",
+    )
+    parser.add_argument(
+        "--monster-batch",
+        action="store_true",
+        help="keep monster state in NumPy arrays and update it in bulk (needs NumPy)",
+    )
+    parser.add_argument(
+        "--asset-timings",
+        action="store_true",
+        help="print how long each asset took to load at startup",
+    )
+    args = parser.parse_args()
+
+    if args.headless is not None:
+        stats = run_headless(
+            PROJECT_DIR,
+            args.headless,
+            seed=args.seed,
+            monster_batch=args.monster_batch,
+            astar_chase=args.astar_chase,
+            path_workers=args.path_workers,
+        )
+        print(
+            f"{stats['ticks']} ticks in {stats['seconds']:.2f}s ({stats['ticks_per_second']:.0f} ticks/s), "
+            f"{stats['monsters_killed']} monsters killed, {stats['coins_collected']} coins, HP {stats['player_hp']}"
+        )
+        return
+
+    game = GamePanel(
+        PROJECT_DIR,
+        dirty_rects=args.dirty_rects,
+        asset_pack=not args.no_asset_pack,
+        crossfade=args.crossfade,
+    )
+    game.fps_cap = args.fps
+    game.profile_csv = args.profile_csv
+    if args.monster_batch:
+        game.use_monster_batch()
+    if args.astar_chase:
+        game.use_astar_chase()
+    if args.path_workers is not None:
+        game.use_path_workers(args.path_workers or None)
+    if args.asset_timings:
+        print(game.asset_loader.report())
+    game.run()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from asset_setter import map_layout
+from map_loader import load_map_file
+from world_map import WorldMap
+
+
+class PreparedMap:
+    # A map that is ready to be swapped in: parsed rows, spawn layout and a built WorldMap.
+    def __init__(self, path: Path, map_name: str, rows: list[str], layout, world: WorldMap):
+        self.path = path
+        self.map_name = map_name
+        self.rows = rows
+        self.layout = layout
+        self.world = world
+
+
+class MapPrefetcher:
+    """Parses and builds the maps reachable from the current one on a background thread.
+
+    Map transitions then call take() and swap in the prepared WorldMap instead of
+    parsing the file and running WorldMap.rebuild_blocked() in the middle of the fade.
+    Entities (player, monsters) are still created on the main thread since they own
+    pygame surfaces; with the image cache warm that is cheap.
+    """
+
+    def __init__(self, tile_size: int, solid_tiles: set[str], inflate_margin: int = 1):
+        self.tile_size = tile_size
+        self.solid_tiles = solid_tiles
+        self.inflate_margin = inflate_margin
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="map-prefetch")
+        self._jobs: dict[tuple[Path, str], object] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, path: Path, map_name: str):
+        rows = load_map_file(path)
+        layout = map_layout(rows, map_name)
+        # WorldMap keeps its own copy of the objects: the layout's dict is handed to the entity spawner too.
+        world = WorldMap(
+            list(rows),
+            self.tile_size,
+            self.solid_tiles,
+            inflate_margin=self.inflate_margin,
+            objects=dict(layout[4]),
+        )
+        return PreparedMap(path, map_name, rows, layout, world)
+
+    def prefetch(self, targets):
+        """Start preparing every (path, map_name) in `targets`; drop jobs for maps no longer adjacent."""
+        wanted = {(Path(path), name) for path, name in targets if Path(path).exists()}
+        for key in list(self._jobs):
+            if key not in wanted:
+                self._jobs.pop(key).cancel()
+        for key in wanted:
+            if key not in self._jobs:
+                self._jobs[key] = self._pool.submit(self._build, *key)
+
+    def take(self, path: Path, map_name: str):
+        """Return the PreparedMap for (path, map_name), or None if it wasn't prefetched.
+
+        Each prepared map is handed out once (the game mutates its objects layer).
+        """
+        job = self._jobs.pop((Path(path), map_name), None)
+        if job is None:
+            self.misses += 1
+            return None
+        try:
+            prepared = job.result()
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return prepared
+
+    def shutdown(self):
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+        self._pool.shutdown(wait=False)
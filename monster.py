@@ -2,12 +2,14 @@ from pathlib import Path
 
 import pygame
 
-from assets import load_image
+from assets import has_image, load_image, variant_cache
 from pathfinding import astar
 
 
 class Monster:
     # Very simple enemy: just sits in place with HP.
+    # While in a MonsterBatch, a monster's class is a Batched<Name> subclass of its own
+    # (see monster_batch.py): use isinstance(), not type(m) is Orc.
     def __init__(
         self,
         pos_px,
@@ -46,6 +48,7 @@ class Monster:
         self._repath_t = 0.0
         self.repath_interval = 0.40
         self._last_goal = None
+        self._flow_version = -1
 
         # Use a small hitbox near the bottom (similar idea to the player).
         hb_w = int(tile_size * 0.75)
@@ -65,41 +68,41 @@ class Monster:
         # Example: bat_down_1.png + bat_down_2.png
         self.direction = "down"
 
-        def load_two_frame(base_name_1: str):
+        def load_frames(paths):
+            return [load_image(p, scale=self.scale) for p in paths]
+
+        self.frames = {d: load_frames(paths) for d, paths in self.frame_paths(assets_dir, sprite_name, scale).items()}
+
+    @staticmethod
+    def frame_paths(assets_dir: Path, sprite_name: str, scale: int = 1):
+        """Sprite files per direction for `sprite_name` (e.g. "orc_down_1.png" + "orc_down_2.png")."""
+
+        def two_frame(base_name_1: str):
             p1 = assets_dir / base_name_1
             if base_name_1.endswith("_1.png"):
                 p2 = assets_dir / base_name_1.replace("_1.png", "_2.png")
             else:
                 p2 = assets_dir / base_name_1
-
-            img1 = load_image(p1)
-            img2 = load_image(p2)
-            return [
-                pygame.transform.scale(img1, (img1.get_width() * self.scale, img1.get_height() * self.scale)),
-                pygame.transform.scale(img2, (img2.get_width() * self.scale, img2.get_height() * self.scale)),
-            ]
+            return [p1, p2]
 
         # Always load the provided direction (usually "down")
         down_name = sprite_name
-        down_frames = load_two_frame(down_name)
+        down_frames = two_frame(down_name)
 
         # If you have directional sprites (orc_left_1.png, orc_up_1.png, etc.), load them.
         # Otherwise, fall back to down frames.
-        def candidate_name(dir_name: str):
-            return down_name.replace("_down_", f"_{dir_name}_")
-
-        def try_load_dir(dir_name: str):
-            name = candidate_name(dir_name)
+        def try_dir(dir_name: str):
+            name = down_name.replace("_down_", f"_{dir_name}_")
             # Only switch to that direction if at least the first frame exists.
-            if (assets_dir / name).exists():
-                return load_two_frame(name)
+            if has_image(assets_dir / name, scale):
+                return two_frame(name)
             return down_frames
 
-        self.frames = {
+        return {
             "down": down_frames,
-            "up": try_load_dir("up"),
-            "left": try_load_dir("left"),
-            "right": try_load_dir("right"),
+            "up": try_dir("up"),
+            "left": try_dir("left"),
+            "right": try_dir("right"),
         }
 
     def _move_and_collide(self, delta: pygame.Vector2, colliders_for_rect):
@@ -131,7 +134,19 @@ class Monster:
         self._knock_vel = direction.normalize() * strength
         self._knock_t = max(self._knock_t, time)
 
-    def update(self, dt: float, player_rect: pygame.Rect, colliders_for_rect, tile_w: int, tile_h: int, is_blocked_tile):
+    def update(
+        self,
+        dt: float,
+        player_rect: pygame.Rect,
+        colliders_for_rect,
+        tile_w: int,
+        tile_h: int,
+        is_blocked_tile,
+        flow_field=None,
+        find_path=None,
+        path_scheduler=None,
+        near_player: bool = True,
+    ):
         # Animate even while idle.
         self._anim_t += dt
         if self._anim_t >= self.anim_frame_time:
@@ -154,21 +169,38 @@ class Monster:
             if self._knock_t > 0:
                 return
 
-        # Only chase the player once they're close enough.
-        to_player = pygame.Vector2(player_rect.center) - pygame.Vector2(self.rect.center)
-        chasing = to_player.length() <= self.aggro_radius_px
+        # Only chase the player once they're close enough. near_player=False means the
+        # caller already knows the player is out of range (see GamePanel.monster_hash).
+        chasing = False
+        if near_player:
+            to_player = pygame.Vector2(player_rect.center) - pygame.Vector2(self.rect.center)
+            chasing = to_player.length() <= self.aggro_radius_px
 
         move = pygame.Vector2(0, 0)
         if chasing and to_player.length_squared() > 0:
-            # A* path on the tile grid.
             start = (int(self.rect.centerx) // self.tile_size, int(self.rect.centery) // self.tile_size)
             goal = (int(player_rect.centerx) // self.tile_size, int(player_rect.centery) // self.tile_size)
 
-            self._repath_t = max(0.0, self._repath_t - dt)
-            if self._repath_t <= 0 or self._last_goal != goal or not self._path:
-                self._repath_t = self.repath_interval
-                self._last_goal = goal
-                self._path = astar(start, goal, is_blocked_tile, tile_w, tile_h)
+            if flow_field is not None:
+                # Shared flow field: head for the next tile downhill, re-reading it once that
+                # tile's center is reached or the field changes (player moved to another tile).
+                if not self._path or self._flow_version != flow_field.version:
+                    self._flow_version = flow_field.version
+                    next_tile = flow_field.next_tile(start)
+                    self._path = [next_tile] if next_tile is not None else []
+            else:
+                # A* path on the tile grid.
+                self._repath_t = max(0.0, self._repath_t - dt)
+                if self._repath_t <= 0 or self._last_goal != goal or not self._path:
+                    self._repath_t = self.repath_interval
+                    self._last_goal = goal
+                    if path_scheduler is not None:
+                        # Keep walking the current path until the scheduler delivers the new one.
+                        path_scheduler.request(self, start, goal, self._set_path)
+                    elif find_path is not None:
+                        self._path = find_path(start, goal)
+                    else:
+                        self._path = astar(start, goal, is_blocked_tile, tile_w, tile_h)
 
             if self._path:
                 next_tile = self._path[0]
@@ -202,12 +234,19 @@ class Monster:
                 self.pos += push * (self.speed * dt)
                 self.rect.topleft = (int(self.pos.x), int(self.pos.y))
 
+    def _set_path(self, path):
+        self._path = path
+
     def is_dead(self):
         return self.dying and self._dying_t >= self.dying_time
 
     def is_dying(self):
         return self.dying
 
+    def is_busy(self):
+        # Timers that must keep running wherever the monster is (see activity.ActivityTiers).
+        return self.dying or self._knock_t > 0 or self._hit_t > 0
+
     def take_damage(self, amount: int):
         if self.dying:
             return False
@@ -228,6 +267,13 @@ class Monster:
         y = self.rect.bottom - img.get_height()
         return x, y
 
+    def get_draw_rect(self):
+        # World-space area that draw() may touch: the sprite plus the HP bar above it.
+        x, y = self.get_draw_pos()
+        img = self.frames[self.direction][self._anim_i]
+        bar_gap = max(6, self.tile_size // 3)
+        return pygame.Rect(x, y - bar_gap, max(img.get_width(), self.tile_size), img.get_height() + bar_gap)
+
     def draw(self, screen: pygame.Surface, camera_offset: pygame.Vector2):
         x, y = self.get_draw_pos()
         img = self.frames[self.direction][self._anim_i]
@@ -235,15 +281,13 @@ class Monster:
         if self._hit_t > 0 and not self.dying:
             if int(self._hit_t * 25) % 2 == 0:
                 return
-            img = img.copy()
-            img.set_alpha(170)
+            img = variant_cache.with_alpha(img, 170, effect="flash")
         if self.dying:
             t = 0.0
             if self.dying_time > 0:
                 t = min(1.0, self._dying_t / self.dying_time)
             alpha = max(0, int(255 * (1.0 - t)))
-            img = img.copy()
-            img.set_alpha(alpha)
+            img = variant_cache.with_alpha(img, alpha, effect="fade")
 
         screen.blit(img, (x - int(camera_offset.x), y - int(camera_offset.y)))
 
@@ -260,13 +304,11 @@ class Monster:
             if self._hp_bar_t < fade_duration:
                 alpha = int(255 * (self._hp_bar_t / fade_duration))
             
-            # Create surfaces with alpha for smooth fade
-            bg_surf = pygame.Surface((bar_w, bar_h), pygame.SRCALPHA)
-            bg_surf.fill((40, 40, 40, alpha))
+            # Cached alpha surfaces for smooth fade (shared between all monsters)
+            bg_surf = variant_cache.filled((bar_w, bar_h), (40, 40, 40), alpha)
             screen.blit(bg_surf, (bar_x, bar_y))
             
             if self.max_hp > 0:
                 fill_w = int(bar_w * (self.hp / self.max_hp))
-                fill_surf = pygame.Surface((fill_w, bar_h), pygame.SRCALPHA)
-                fill_surf.fill((200, 50, 50, alpha))
+                fill_surf = variant_cache.filled((fill_w, bar_h), (200, 50, 50), alpha)
                 screen.blit(fill_surf, (bar_x, bar_y))
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""Struct-of-arrays monster state with vectorised updates (optional, needs NumPy).
+
+    python main.py --monster-batch
+
+MonsterBatch keeps the per-monster numbers (position, HP, timers, flags) in NumPy
+arrays, one row per monster. The Bat / GreenSlime / Orc objects stay in
+GamePanel.monsters and keep drawing and pathfinding themselves, but while they are
+in a batch their ROW_FIELDS attributes are views into their row: reading m.hp
+reads the array. For that, add() switches the monster to a subclass of its own
+class (BatchedOrc for an Orc, and so on): isinstance() checks still hold, but
+type(m) is Orc is False until remove() switches it back.
+
+Each tick, update() works out in a few array passes which monsters need the full
+Monster.update() (chasing, or touching the player) and advances everyone else
+in bulk: animation and hit/HP-bar timers, dying timers, and knockback movement
+(a monster whose knockback would touch a wall is moved by Monster itself, so
+collisions behave the same). in_contact() finds the monsters close enough to
+hurt the player. With thousands of monsters on a map, most are neither chasing
+nor near the player, and those now cost a few array operations in total.
+"""
+
+from __future__ import annotations
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for this backend.
+    np = None
+
+
+# Monster attributes stored in the batch's arrays, with their dtypes.
+ROW_FIELDS = {
+    "hp": "i4",
+    "dying": "?",
+    "_dying_t": "f8",
+    "_anim_t": "f8",
+    "_anim_i": "i1",
+    "_hit_t": "f8",
+    "_hp_bar_t": "f8",
+    "_knock_t": "f8",
+}
+# Per-row values the vectorised passes read, copied from the monster when it joins.
+_STATIC_FIELDS = {"x": "f8", "y": "f8", "w": "i4", "h": "i4", "aggro": "f8", "frame_time": "f8"}
+
+
+class _RowField:
+    # Descriptor that makes a monster attribute a view into its batch row.
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._batch.arrays[self.name][obj._row].item()
+
+    def __set__(self, obj, value):
+        obj._batch.arrays[self.name][obj._row] = value
+
+
+_view_classes: dict[type, type] = {}
+
+
+def _view_class(cls: type):
+    # Subclass of cls whose ROW_FIELDS read and write the batch arrays.
+    view = _view_classes.get(cls)
+    if view is None:
+        view_name = f"Batched{cls.__name__}"
+        attrs = {name: _RowField(name) for name in ROW_FIELDS}
+        attrs["_plain_class"] = cls
+        attrs["__module__"] = __name__
+        attrs["__qualname__"] = view_name
+        view = type(view_name, (cls,), attrs)
+        _view_classes[cls] = view
+    return view
+
+
+class MonsterBatch:
+    def __init__(self, monsters=()):
+        if np is None:
+            raise RuntimeError("the monster batch backend needs NumPy (pip install numpy)")
+        self.monsters: list = []
+        self.arrays: dict[str, np.ndarray] = {}
+        self._grow(64)
+        for m in monsters:
+            self.add(m)
+
+        # Solid-tile map for knockback moves: (world, blocked_version) it was built for.
+        self._solid = None
+        self._solid_key = None
+
+        # Rows handed to Monster.update() on the last tick.
+        self.full_updates = 0
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def _grow(self, capacity: int):
+        n = len(self.monsters)
+        for name, dtype in {**ROW_FIELDS, **_STATIC_FIELDS}.items():
+            grown = np.zeros(capacity, dtype=dtype)
+            old = self.arrays.get(name)
+            if old is not None:
+                grown[:n] = old[:n]
+            self.arrays[name] = grown
+
+    # ------------------------------------------------------------------
+    # membership
+    # ------------------------------------------------------------------
+    def add(self, m):
+        """Move monster m's state into a new row and turn it into a view of that row."""
+        row = len(self.monsters)
+        if row >= len(self.arrays["hp"]):
+            self._grow(2 * row)
+        values = {name: m.__dict__.pop(name) for name in ROW_FIELDS}
+        m._batch = self
+        m._row = row
+        m.__class__ = _view_class(type(m))
+        for name, value in values.items():
+            self.arrays[name][row] = value
+
+        a = self.arrays
+        a["x"][row] = m.pos.x
+        a["y"][row] = m.pos.y
+        a["w"][row] = m.rect.w
+        a["h"][row] = m.rect.h
+        a["aggro"][row] = m.aggro_radius_px
+        a["frame_time"][row] = m.anim_frame_time
+        self.monsters.append(m)
+
+    def remove(self, m):
+        """Give m its own attributes back and drop its row (the last row takes its place)."""
+        row = m._row
+        values = {name: getattr(m, name) for name in ROW_FIELDS}
+        m.__class__ = m._plain_class
+        del m._batch, m._row
+        m.__dict__.update(values)
+
+        last = len(self.monsters) - 1
+        if row != last:
+            moved = self.monsters[last]
+            for array in self.arrays.values():
+                array[row] = array[last]
+            self.monsters[row] = moved
+            moved._row = row
+        self.monsters.pop()
+
+    def reset(self, monsters):
+        for m in list(self.monsters):
+            self.remove(m)
+        for m in monsters:
+            self.add(m)
+
+    def sync_position(self, m):
+        # After m moved on its own (Monster.update, push-out).
+        self.arrays["x"][m._row] = m.pos.x
+        self.arrays["y"][m._row] = m.pos.y
+
+    # ------------------------------------------------------------------
+    # vectorised passes
+    # ------------------------------------------------------------------
+    def _centers(self, n: int):
+        a = self.arrays
+        # Same as rect.center with rect.topleft = (int(pos.x), int(pos.y)).
+        cx = a["x"][:n].astype(np.int64) + a["w"][:n] // 2
+        cy = a["y"][:n].astype(np.int64) + a["h"][:n] // 2
+        return cx, cy
+
+    def _solid_tiles(self, world):
+        # [x, y] -> True where colliders_for_rect() would return a collider.
+        key = (id(world), world.blocked_version)
+        if self._solid_key != key:
+            w, h = world.w, world.h
+            # One code point per tile, as an [x, y] array.
+            text = "".join(row[:w].ljust(w) for row in world.rows)
+            tiles = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").reshape(h, w).T
+            solid = np.isin(tiles, [ord(ch) for ch in world.solid_tiles])
+            for (tx, ty), obj in world.objects.items():
+                if obj in world.blocking_objects and 0 <= tx < world.w and 0 <= ty < world.h:
+                    solid[tx, ty] = True
+            self._solid = solid
+            self._solid_key = key
+        return self._solid
+
+    def _rect_free(self, solid, x, y, w, h, tile_size: int):
+        # Per row: does the rect at (int(x), int(y)) stay inside the map and off solid tiles?
+        # Monster hitboxes are smaller than a tile, so checking the corner tiles covers it.
+        left = x.astype(np.int64)
+        top = y.astype(np.int64)
+        tx0 = left // tile_size
+        ty0 = top // tile_size
+        tx1 = (left + w - 1) // tile_size
+        ty1 = (top + h - 1) // tile_size
+        mw, mh = solid.shape
+        inside = (left >= 0) & (top >= 0) & (tx1 < mw) & (ty1 < mh)
+        free = inside.copy()
+        if inside.any():
+            i = np.flatnonzero(inside)
+            free[i] = ~(solid[tx0[i], ty0[i]] | solid[tx1[i], ty0[i]] | solid[tx0[i], ty1[i]] | solid[tx1[i], ty1[i]])
+        return free
+
+    def update(self, dt: float, player_rect: pygame.Rect, world, tile_size: int, run_monster):
+        """One tick for every monster in the batch. Returns the monsters that moved.
+
+        `run_monster(m)` runs the full Monster.update() for m; it's used for the
+        monsters that chase the player or touch them, and for knockbacks into walls.
+        """
+        n = len(self.monsters)
+        if n == 0:
+            self.full_updates = 0
+            return []
+        a = self.arrays
+        dying = a["dying"][:n]
+        knock_t = a["_knock_t"][:n]
+
+        # Who needs the full update: chasing (their own aggro check) and not still being
+        # knocked back after this tick, or overlapping the player (push-out).
+        cx, cy = self._centers(n)
+        pcx, pcy = player_rect.center
+        dist_sq = (cx - pcx) ** 2 + (cy - pcy) ** 2
+        chasing = dist_sq <= a["aggro"][:n] ** 2
+        left = a["x"][:n].astype(np.int64)
+        top = a["y"][:n].astype(np.int64)
+        touching = (
+            (left < player_rect.right)
+            & (left + a["w"][:n] > player_rect.left)
+            & (top < player_rect.bottom)
+            & (top + a["h"][:n] > player_rect.top)
+        )
+        full = ~dying & (((knock_t <= dt) & chasing) | touching)
+        rest = ~full
+
+        # Animation and hit / HP-bar timers.
+        anim_t = a["_anim_t"][:n]
+        anim_t[rest] += dt
+        flip = rest & (anim_t >= a["frame_time"][:n])
+        anim_t[flip] = 0.0
+        anim_i = a["_anim_i"][:n]
+        anim_i[flip] = 1 - anim_i[flip]
+        for name in ("_hit_t", "_hp_bar_t"):
+            t = a[name][:n]
+            t[rest] = np.maximum(0.0, t[rest] - dt)
+
+        a["_dying_t"][:n][rest & dying] += dt
+
+        # Knockback: integrate in bulk where the path stays clear of walls.
+        moved = []
+        knocked = np.flatnonzero(rest & ~dying & (knock_t > 0))
+        if len(knocked):
+            knock_t[knocked] = np.maximum(0.0, knock_t[knocked] - dt)
+            monsters = self.monsters
+            vx = np.array([monsters[i]._knock_vel.x for i in knocked]) * dt
+            vy = np.array([monsters[i]._knock_vel.y for i in knocked]) * dt
+            x0 = a["x"][knocked]
+            y0 = a["y"][knocked]
+            w = a["w"][knocked]
+            h = a["h"][knocked]
+            solid = self._solid_tiles(world)
+            # Monster moves along x first, then y: both rects have to be clear.
+            clear = self._rect_free(solid, x0 + vx, y0, w, h, tile_size) & self._rect_free(
+                solid, x0 + vx, y0 + vy, w, h, tile_size
+            )
+            a["x"][knocked[clear]] = x0[clear] + vx[clear]
+            a["y"][knocked[clear]] = y0[clear] + vy[clear]
+            for j, i in enumerate(knocked):
+                m = monsters[i]
+                if clear[j]:
+                    m.pos.update(a["x"][i], a["y"][i])
+                    m.rect.topleft = (int(m.pos.x), int(m.pos.y))
+                else:
+                    m._move_and_collide(pygame.Vector2(vx[j], vy[j]), world.colliders_for_rect)
+                    self.sync_position(m)
+                moved.append(m)
+
+        full_rows = np.flatnonzero(full)
+        for i in full_rows:
+            m = self.monsters[i]
+            run_monster(m)
+            self.sync_position(m)
+            moved.append(m)
+        self.full_updates = len(full_rows)
+        return moved
+
+    def in_contact(self, center, radius: float):
+        """Living monsters whose center is within `radius` of `center`, in row order."""
+        n = len(self.monsters)
+        if n == 0:
+            return []
+        cx, cy = self._centers(n)
+        dist_sq = (cx - center[0]) ** 2 + (cy - center[1]) ** 2
+        hits = np.flatnonzero((dist_sq <= radius * radius) & ~self.arrays["dying"][:n])
+        return [self.monsters[i] for i in hits]
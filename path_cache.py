@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from pathfinding import astar
+
+
+class PathCache:
+    """Bounded LRU of A* results keyed by (start, goal).
+
+    Entries are only valid for one version of the map's blocked set (see
+    WorldMap.blocked_version); a lookup with a newer version empties the cache.
+    On a miss, a cached path to the same goal that passes through `start` is
+    reused from that tile on (any suffix of a shortest path is a shortest path).
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.version = None
+        self._paths: OrderedDict[tuple[tuple[int, int], tuple[int, int]], list[tuple[int, int]]] = OrderedDict()
+        # goal -> starts of the cached paths leading to it (for suffix reuse).
+        self._by_goal: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+        self.hits = 0
+        self.suffix_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def clear(self):
+        self._paths.clear()
+        self._by_goal.clear()
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._paths:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    def _store(self, key, path):
+        self._paths[key] = path
+        self._by_goal.setdefault(key[1], set()).add(key[0])
+        while len(self._paths) > self.max_entries:
+            (old_start, old_goal), _ = self._paths.popitem(last=False)
+            starts = self._by_goal[old_goal]
+            starts.discard(old_start)
+            if not starts:
+                del self._by_goal[old_goal]
+
+    def _suffix(self, start, goal):
+        for other_start in self._by_goal.get(goal, ()):
+            path = self._paths[(other_start, goal)]
+            if start in path:
+                return path[path.index(start) + 1 :]
+        return None
+
+    def lookup(self, start, goal, version=None):
+        """The cached path from start to goal (a new list), or None on a miss.
+
+        Misses are not counted here: the caller searches and store()s the result.
+        """
+        self._check_version(version)
+        key = (start, goal)
+        path = self._paths.get(key)
+        if path is not None:
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return list(path)
+
+        path = self._suffix(start, goal)
+        if path is not None:
+            self.suffix_hits += 1
+            self._store(key, path)
+            return list(path)
+        return None
+
+    def store(self, start, goal, path, version=None):
+        """Remember a path searched after lookup(start, goal, version) missed.
+
+        It is dropped if the map has changed since (the cache moved to a newer version).
+        """
+        if version != self.version:
+            return
+        self.misses += 1
+        self._store((start, goal), list(path))
+
+    def find_path(self, start, goal, is_blocked, w: int, h: int, version=None, search=None):
+        """astar(start, goal, ...) through the cache. Returns a new list the caller may consume.
+
+        `search(start, goal)` replaces astar() for misses (e.g. BlockedGrid.jps).
+        """
+        path = self.lookup(start, goal, version)
+        if path is not None:
+            return path
+        path = search(start, goal) if search is not None else astar(start, goal, is_blocked, w, h)
+        self.store(start, goal, path, version)
+        return list(path)
+
+    def stats(self):
+        lookups = self.hits + self.suffix_hits + self.misses
+        return {
+            "entries": len(self._paths),
+            "hits": self.hits,
+            "suffix_hits": self.suffix_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.suffix_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from pathfinding import GridSearch
+
+
+class _Job:
+    __slots__ = ("key", "start", "goal", "on_done", "order", "version", "search", "waited", "future")
+
+    def __init__(self, key, start, goal, on_done, order: int):
+        self.key = key
+        self.start = start
+        self.goal = goal
+        self.on_done = on_done
+        self.order = order
+        self.version = None
+        self.search: GridSearch | None = None
+        self.waited = 0  # frames this request has been pending
+        self.future = None  # PathWorkerPool only
+
+
+class PathScheduler:
+    """Runs the monsters' path searches within a per-frame node budget.
+
+    Monsters request() a path instead of searching themselves and keep walking their
+    old one until on_done(path) is called from a later run(). Each run() first serves
+    cached paths (WorldMap.path_cache), then works on A* searches in priority order:
+    monsters on screen, then the ones closest to their goal (the player). Searches are
+    resumable (GridSearch, on the map's BlockedGrid), so a long one is spread over
+    several frames instead of making one frame slow, and requests made on the same
+    frame are spread out too.
+
+    Searches that can't be split (JPS, HPA*; see WorldMap.search_mode) run whole and
+    are charged WHOLE_SEARCH_COST nodes.
+    """
+
+    WHOLE_SEARCH_COST = 250
+    # Requests pending this many frames go first, so far-away monsters aren't starved.
+    MAX_WAIT_FRAMES = 30
+
+    def __init__(self, node_budget: int = 1500, max_nodes: int = 4000):
+        self.node_budget = node_budget
+        self.max_nodes = max_nodes
+        self._jobs: dict[object, _Job] = {}
+        self._order = 0
+        # On-screen tiles as (x0, y0, x1, y1), inclusive; None = no on-screen priority.
+        self.view: tuple[int, int, int, int] | None = None
+
+        self.completed = 0
+        self.nodes_last_run = 0
+
+    def request(self, key, start, goal, on_done):
+        """Ask for a path from start to goal for `key` (e.g. the monster).
+
+        A newer request replaces the pending one for the same key, unless it has the
+        same goal: then the search already under way is kept, and its path is delivered
+        from the new start on (or searched again if the new start is off that path).
+        """
+        job = self._jobs.get(key)
+        if job is not None and job.goal == goal:
+            job.start = start
+            job.on_done = on_done
+            return
+        self._order += 1
+        self._jobs[key] = _Job(key, start, goal, on_done, self._order)
+
+    def pending(self, key=None):
+        """Number of pending requests, or whether `key` has one."""
+        if key is not None:
+            return key in self._jobs
+        return len(self._jobs)
+
+    def cancel(self, key):
+        self._jobs.pop(key, None)
+
+    def clear(self):
+        self._jobs.clear()
+
+    def shutdown(self):
+        self.clear()
+
+    def set_view(self, x0: int, y0: int, x1: int, y1: int):
+        self.view = (x0, y0, x1, y1)
+
+    def _priority(self, job: _Job):
+        sx, sy = job.start
+        gx, gy = job.goal
+        view = self.view
+        on_screen = view is not None and view[0] <= sx <= view[2] and view[1] <= sy <= view[3]
+        return (job.waited < self.MAX_WAIT_FRAMES, not on_screen, abs(sx - gx) + abs(sy - gy), job.order)
+
+    def _finish(self, job: _Job, path):
+        del self._jobs[job.key]
+        self.completed += 1
+        job.on_done(path)
+
+    def run(self, world):
+        """Work on pending requests for up to node_budget A* nodes. Call once per tick."""
+        version = world.blocked_version
+        cache = world.path_cache
+        used = 0
+        for job in sorted(self._jobs.values(), key=self._priority):
+            if used >= self.node_budget:
+                job.waited += 1
+                continue
+            if job.version != version:
+                # New request, or the map changed under a running search: (re)start it.
+                job.version = version
+                job.search = None
+                path = cache.lookup(job.start, job.goal, version)
+                if path is not None:
+                    self._finish(job, path)
+                    continue
+                if world.uses_jps or world.uses_hpa:
+                    used += self.WHOLE_SEARCH_COST
+                    self._finish(job, world.find_path(job.start, job.goal))
+                    continue
+                job.search = world.blocked_grid.search(job.start, job.goal, self.max_nodes)
+
+            search = job.search
+            used += search.step(self.node_budget - used)
+            if not search.done:
+                job.waited += 1
+                continue
+            cache.store(search.start, job.goal, search.path, version)
+            if search.start == job.start:
+                self._finish(job, list(search.path))
+                continue
+            # The monster has moved on since the search started: take the rest of the path
+            # from where it is now, or search again from there.
+            path = cache.lookup(job.start, job.goal, version)
+            if path is not None:
+                self._finish(job, path)
+            else:
+                job.version = None
+                job.search = None
+                job.waited += 1
+        self.nodes_last_run = used
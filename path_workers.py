@@ -0,0 +1,224 @@
+"""Path searches in worker processes, over a blocked grid in shared memory.
+
+The simulation runs on one core (the GIL); with a lot of A*-chasing monsters the
+searches are the biggest cost. PathWorkerPool takes the same requests as
+PathScheduler but runs the searches in a process pool:
+
+    python main.py --path-workers 4
+
+The map's blocked bitmap (WorldMap.blocked_grid.cells) is copied into one
+multiprocessing.shared_memory block whenever it changes, together with a new
+grid version. Every search is sent with the version it was made for; results
+that come back for an older version are thrown away and the request is sent again.
+
+If the pool breaks (a worker process was killed), the pending searches are run on
+the game process and PathWorkerPool carries on as a plain PathScheduler.
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from path_scheduler import PathScheduler, _Job
+from pathfinding import BlockedGrid
+
+
+# ----------------------------------------------------------------------
+# worker side
+# ----------------------------------------------------------------------
+# The grid this worker process has attached: (shm name, w, h) -> (shm, grid, version).
+_attached: dict = {}
+
+
+def _detach():
+    # The grid's view into the block must be released before the block can be closed.
+    for shm, grid, _ in _attached.values():
+        grid.cells.release()
+        shm.close()
+    _attached.clear()
+
+
+atexit.register(_detach)
+
+
+def _worker_grid(shm_name: str, w: int, h: int, version: int):
+    key = (shm_name, w, h)
+    entry = _attached.get(key)
+    if entry is None:
+        _detach()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        grid = BlockedGrid(w, h)
+        grid.cells = shm.buf[: w * h]
+        entry = (shm, grid, version)
+    elif entry[2] != version:
+        entry[1].invalidate()
+        entry = (entry[0], entry[1], version)
+    _attached[key] = entry
+    return entry[1]
+
+
+def _search(shm_name: str, w: int, h: int, version: int, use_jps: bool, start, goal, max_nodes: int):
+    grid = _worker_grid(shm_name, w, h, version)
+    if use_jps:
+        return version, start, grid.jps(start, goal, max_nodes)
+    return version, start, grid.astar(start, goal, max_nodes)
+
+
+# ----------------------------------------------------------------------
+# game side
+# ----------------------------------------------------------------------
+class SharedGrid:
+    """The current WorldMap's blocked bitmap, published in shared memory."""
+
+    def __init__(self):
+        self.shm: shared_memory.SharedMemory | None = None
+        self.w = 0
+        self.h = 0
+        self.version = 0
+        self._world = None
+        self._world_version = None
+
+    def publish(self, world):
+        """Copy world's blocked grid into shared memory if it changed. Returns True if it did."""
+        if world is self._world and world.blocked_version == self._world_version:
+            return False
+        cells = world.blocked_grid.cells
+        if self.shm is None or self.shm.size < len(cells):
+            self.close()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, len(cells)))
+        self.shm.buf[: len(cells)] = cells
+        self.w, self.h = world.w, world.h
+        self.version += 1
+        self._world = world
+        self._world_version = world.blocked_version
+        return True
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class PathWorkerPool(PathScheduler):
+    """PathScheduler whose searches run in `workers` processes.
+
+    run() never waits for a worker: it hands new requests to the pool (at most
+    `workers * 4` in flight, in PathScheduler's priority order) and delivers the
+    results that are ready. Cached paths are still served on the main process, and
+    so are HPA* searches (its cluster graph lives in the WorldMap).
+    """
+
+    def __init__(self, workers: int | None = None, max_nodes: int = 4000):
+        super().__init__(max_nodes=max_nodes)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_in_flight = self.workers * 4
+        # "spawn": the workers only need pathfinding, not a copy of the game (or of SDL's state).
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.grid = SharedGrid()
+        # Searches nobody waits for any more that were already running (can't be cancelled);
+        # they still occupy a worker, so they count toward max_in_flight until they end.
+        self._orphans = []
+        # Set once a worker process died; the searches then run here (PathScheduler.run).
+        self.broken = False
+
+        self.stale_results = 0
+
+    def _drop(self, job: _Job):
+        if job.future is not None and not job.future.cancel():
+            self._orphans.append(job.future)
+        job.future = None
+
+    def request(self, key, start, goal, on_done):
+        job = self._jobs.get(key)
+        if job is not None and job.goal != goal:
+            # Replaced below: stop its search instead of letting it take a worker's time.
+            self._drop(job)
+        super().request(key, start, goal, on_done)
+
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            self._drop(job)
+
+    def clear(self):
+        for job in self._jobs.values():
+            self._drop(job)
+        self._jobs.clear()
+
+    def _break(self, job: _Job, world):
+        # A worker died and took the pool with it: every outstanding search is lost.
+        # `job` is searched here right away, the others by PathScheduler.run() from the next tick on.
+        self.broken = True
+        self._orphans.clear()
+        for other in self._jobs.values():
+            other.future = None
+            other.version = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._finish(job, world.find_path(job.start, job.goal))
+
+    def shutdown(self):
+        self.clear()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self.grid.close()
+
+    def _submit(self, job: _Job, world):
+        grid = self.grid
+        job.version = grid.version
+        job.future = self._pool.submit(
+            _search, grid.shm.name, grid.w, grid.h, grid.version, world.uses_jps, job.start, job.goal, self.max_nodes
+        )
+
+    def run(self, world):
+        """Deliver finished searches and hand new requests to the workers. Call once per tick."""
+        if self.broken:
+            super().run(world)
+            return
+        grid = self.grid
+        grid.publish(world)
+        cache = world.path_cache
+
+        self._orphans = [f for f in self._orphans if not f.done()]
+        in_flight = len(self._orphans)
+        for job in sorted(self._jobs.values(), key=self._priority):
+            future = job.future
+            if future is not None:
+                if not future.done():
+                    in_flight += 1
+                    job.waited += 1
+                    continue
+                job.future = None
+                try:
+                    version, start, path = future.result()
+                except BrokenProcessPool:
+                    self._break(job, world)
+                    return
+                if version == grid.version:
+                    cache.store(start, job.goal, path, world.blocked_version)
+                    if start == job.start:
+                        self._finish(job, path)
+                        continue
+                    # The monster has moved on since: the lookup below takes the rest of the
+                    # path from where it is now, or the search is sent again.
+                else:
+                    # Searched on a grid that has changed since: ask again.
+                    self.stale_results += 1
+
+            path = cache.lookup(job.start, job.goal, world.blocked_version)
+            if path is not None:
+                self._finish(job, path)
+            elif world.uses_hpa:
+                self._finish(job, world.find_path(job.start, job.goal))
+            elif in_flight < self.max_in_flight:
+                try:
+                    self._submit(job, world)
+                except BrokenProcessPool:
+                    self._break(job, world)
+                    return
+                in_flight += 1
+            else:
+                job.waited += 1
@@ -1,8 +1,16 @@
 import heapq
+from array import array
+from collections import deque
 
 
 def astar(start, goal, is_blocked, w: int, h: int, max_nodes: int = 4000):
-    """Simple grid A* (4-neighbor). Returns a list of tile coords from start->goal (excluding start)."""
+    """Simple grid A* (4-neighbor). Returns a list of tile coords from start->goal (excluding start).
+
+    `is_blocked(x, y)` is a callback, or a BlockedGrid to run the faster array-based engine.
+    """
+
+    if isinstance(is_blocked, BlockedGrid):
+        return is_blocked.astar(start, goal, max_nodes)
 
     if start == goal:
         return []
@@ -68,3 +76,519 @@ def inflate_blocked(blocked: set[tuple[int, int]], w: int, h: int, margin: int =
                 if 0 <= nx < w and 0 <= ny < h:
                     inflated.add((nx, ny))
     return inflated
+
+
+def distance_field(goal, is_blocked, w: int, h: int, radius: int):
+    """Breadth-first step counts to `goal` (4-neighbor) over the open tiles within `radius` of it.
+
+    Returns {tile: steps}; tiles outside the radius (Chebyshev) or cut off by walls are absent.
+    """
+
+    gx, gy = goal
+    if not (0 <= gx < w and 0 <= gy < h) or is_blocked(gx, gy):
+        return {}
+
+    min_x, max_x = max(0, gx - radius), min(w - 1, gx + radius)
+    min_y, max_y = max(0, gy - radius), min(h - 1, gy + radius)
+
+    dist = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        x, y = queue.popleft()
+        nd = dist[(x, y)] + 1
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if not (min_x <= nx <= max_x and min_y <= ny <= max_y):
+                continue
+            if (nx, ny) in dist or is_blocked(nx, ny):
+                continue
+            dist[(nx, ny)] = nd
+            queue.append((nx, ny))
+    return dist
+
+
+class AStarSearch:
+    """astar() split into steps, so one search can be spread over several frames.
+
+    step(budget) expands at most `budget` nodes; once `done` is set, `path` holds
+    the same result astar() would have returned.
+    """
+
+    def __init__(self, start, goal, is_blocked, w: int, h: int, max_nodes: int = 4000):
+        self.start = start
+        self.goal = goal
+        self.is_blocked = is_blocked
+        self.w = w
+        self.h = h
+        self.max_nodes = max_nodes
+
+        self.done = False
+        self.path = []
+        self.visited = 0
+
+        sx, sy = start
+        gx, gy = goal
+        if start == goal or not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h) or is_blocked(gx, gy):
+            self.done = True
+            return
+        self._open_heap = [(abs(sx - gx) + abs(sy - gy), 0, start)]
+        self._came_from = {}
+        self._g_score = {start: 0}
+
+    def step(self, budget: int):
+        """Expand up to `budget` nodes. Returns how many were expanded."""
+        if self.done:
+            return 0
+        is_blocked = self.is_blocked
+        w, h = self.w, self.h
+        gx, gy = self.goal
+        open_heap = self._open_heap
+        came_from = self._came_from
+        g_score = self._g_score
+
+        expanded = 0
+        while open_heap and self.visited < self.max_nodes and expanded < budget:
+            _, g, (x, y) = heapq.heappop(open_heap)
+            self.visited += 1
+            expanded += 1
+
+            if (x, y) == (gx, gy):
+                path = []
+                cur = (x, y)
+                while cur != self.start:
+                    path.append(cur)
+                    cur = came_from[cur]
+                path.reverse()
+                self.path = path
+                self.done = True
+                return expanded
+
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                if is_blocked(nx, ny):
+                    continue
+
+                ng = g + 1
+                if ng < g_score.get((nx, ny), 10**9):
+                    g_score[(nx, ny)] = ng
+                    came_from[(nx, ny)] = (x, y)
+                    heapq.heappush(open_heap, (ng + abs(nx - gx) + abs(ny - gy), ng, (nx, ny)))
+
+        if not open_heap or self.visited >= self.max_nodes:
+            # No path (or gave up): same empty result as astar().
+            self.done = True
+        return expanded
+
+
+class BlockedGrid:
+    """Blocked tiles as a flat bytearray, plus an A* engine that runs on it.
+
+    Cells are stored column-major (index = x * h + y) so that comparing indices
+    orders tiles exactly like comparing (x, y) tuples: ties break the same way
+    as in the tuple-based astar() and both return the same paths.
+
+    A grid can be passed to astar() in place of an is_blocked callback, and can
+    also be called like one: grid(x, y).
+    """
+
+    # Finished searches' arrays kept for reuse (each set is 16 bytes per cell).
+    MAX_SPARE_STATES = 4
+
+    def __init__(self, w: int, h: int, blocked=()):
+        self.w = w
+        self.h = h
+        self.cells = bytearray(w * h)
+        for x, y in blocked:
+            self.cells[x * h + y] = 1
+
+        # Per-column jump tables for jps(), built the first time a search touches a column.
+        self._columns: dict[int, tuple[array, array, array, array]] = {}
+
+        # Search state: [g, parent, seen, closed, generation] arrays over the cells, one
+        # set per unfinished search, reused once a search is done. A cell's g-score /
+        # parent are only valid if its stamp equals the set's current generation, so
+        # nothing has to be cleared between searches.
+        self._spare_states: list[list] = []
+
+    def __call__(self, x: int, y: int):
+        return self.cells[x * self.h + y] == 1
+
+    def set_blocked(self, x: int, y: int, blocked: bool = True):
+        self.cells[x * self.h + y] = 1 if blocked else 0
+        for cx in (x - 1, x, x + 1):
+            self._columns.pop(cx, None)
+
+    def reset(self, blocked=(), margin: int = 0):
+        """Replace every cell: `blocked` tiles become blocked, the rest open.
+
+        With a `margin`, the cells within that Chebyshev distance of a blocked tile
+        are blocked too (the same tiles as inflate_blocked(blocked, w, h, margin)).
+        """
+        cells = self.cells
+        n = len(cells)
+        cells[:] = bytes(n)
+        h = self.h
+        for x, y in blocked:
+            cells[x * h + y] = 1
+        if margin > 0 and n:
+            # Grow the marked cells on the bitmap as one big int (a byte per cell)
+            # instead of visiting every neighbor of every tile.
+            bits = int.from_bytes(cells, "little")
+            not_first = int.from_bytes((b"\x00" + b"\x01" * (h - 1)) * self.w, "little")
+            not_last = int.from_bytes((b"\x01" * (h - 1) + b"\x00") * self.w, "little")
+            for _ in range(margin):
+                # y +- 1 within each column (a column's last cell must not spill into the next one).
+                bits |= ((bits << 8) & not_first) | ((bits >> 8) & not_last)
+            whole = (1 << (8 * n)) - 1
+            for _ in range(margin):
+                # x +- 1: a whole column over.
+                bits |= ((bits << (8 * h)) & whole) | (bits >> (8 * h))
+            cells[:] = bits.to_bytes(n, "little")
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget the jump tables after `cells` was changed directly (e.g. through shared memory)."""
+        self._columns.clear()
+
+    def open_fraction(self):
+        n = len(self.cells)
+        return 1.0 - self.cells.count(1) / n if n else 0.0
+
+    def _take_state(self):
+        # A set of search arrays with a fresh generation (see GridSearch).
+        if self._spare_states:
+            state = self._spare_states.pop()
+        else:
+            n = self.w * self.h
+            state = [array("i", bytes(4 * n)), array("i", bytes(4 * n)), None, None, 0xFFFFFFFF]
+        if state[4] >= 0xFFFFFFFF:
+            # New set, or the stamps wrapped around: start over from clean stamps.
+            n = self.w * self.h
+            state[2] = array("I", bytes(4 * n))
+            state[3] = array("I", bytes(4 * n))
+            state[4] = 0
+        state[4] += 1
+        return state
+
+    def _give_back_state(self, state):
+        if len(self._spare_states) < self.MAX_SPARE_STATES:
+            self._spare_states.append(state)
+
+    def astar(self, start, goal, max_nodes: int = 4000):
+        """Same contract and result as astar(start, goal, is_blocked, w, h, max_nodes)."""
+        search = GridSearch(self, start, goal, max_nodes)
+        search.step(max_nodes)
+        return search.path
+
+    def search(self, start, goal, max_nodes: int = 4000):
+        """A resumable astar() on this grid (see GridSearch)."""
+        return GridSearch(self, start, goal, max_nodes)
+
+    def _column(self, x: int):
+        """Jump tables for column x: (stop_down, stop_up, reach_down, reach_up).
+
+        stop_down[y] is the first row below y where a downward scan from y finds a
+        forced neighbour (-1 if a wall comes first); reach_down[y] is the last row a
+        downward scan from y can reach. Same for up.
+        """
+        tables = self._columns.get(x)
+        if tables is not None:
+            return tables
+
+        w = self.w
+        h = self.h
+        cells = self.cells
+        col = x * h
+        left = col - h if x > 0 else -1
+        right = col + h if x < w - 1 else -1
+
+        def side_open(side, y):
+            return side >= 0 and 0 <= y < h and not cells[side + y]
+
+        def forced(y, dy):
+            # Moving by dy into row y: a side tile opens up next to one that was blocked.
+            return (side_open(left, y) and not side_open(left, y - dy)) or (
+                side_open(right, y) and not side_open(right, y - dy)
+            )
+
+        stop_down = array("i", bytes(4 * h))
+        reach_down = array("i", bytes(4 * h))
+        stop, reach = -1, h - 1
+        for y in range(h - 1, -1, -1):
+            stop_down[y] = stop
+            reach_down[y] = reach
+            if cells[col + y]:
+                stop, reach = -1, y - 1
+            elif forced(y, 1):
+                stop = y
+
+        stop_up = array("i", bytes(4 * h))
+        reach_up = array("i", bytes(4 * h))
+        stop, reach = -1, 0
+        for y in range(h):
+            stop_up[y] = stop
+            reach_up[y] = reach
+            if cells[col + y]:
+                stop, reach = -1, y + 1
+            elif forced(y, -1):
+                stop = y
+
+        tables = (stop_down, stop_up, reach_down, reach_up)
+        self._columns[x] = tables
+        return tables
+
+    def jps(self, start, goal, max_nodes: int = 4000, max_cells: int = 250_000):
+        """Jump Point Search for 4-connected grids; returns a shortest path like astar().
+
+        Straight runs are skipped instead of pushed tile by tile: horizontal scans
+        stop where turning vertical would reach the goal or a forced neighbour (an
+        opening next to a wall), vertical scans stop at the goal or a forced
+        neighbour. Only those jump points go on the open list, so open areas cost a
+        handful of expansions. Vertical scans are table lookups (see _column()).
+        `max_nodes` caps expansions and `max_cells` the tiles scanned; when either
+        runs out it gives up and returns [] like astar().
+
+        Paths are as short as astar()'s; where several shortest paths exist it may
+        pick a different one.
+        """
+        if start == goal:
+            return []
+
+        w = self.w
+        h = self.h
+        cells = self.cells
+        sx, sy = start
+        gx, gy = goal
+        if not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h):
+            return []
+        if cells[gx * h + gy]:
+            return []
+
+        column = self._column
+        budget = [max_cells]
+
+        def is_open(x, y):
+            return 0 <= x < w and 0 <= y < h and not cells[x * h + y]
+
+        def scan_v(x, y, dy):
+            # First jump point (goal or forced neighbour) straight up/down from (x, y), or None.
+            stop_down, stop_up, reach_down, reach_up = column(x)
+            if dy > 0:
+                stop = stop_down[y]
+                if x == gx and y < gy <= reach_down[y] and (stop < 0 or gy < stop):
+                    return (x, gy)
+            else:
+                stop = stop_up[y]
+                if x == gx and reach_up[y] <= gy < y and (stop < 0 or gy > stop):
+                    return (x, gy)
+            return (x, stop) if stop >= 0 else None
+
+        def scan_h(x, y, dx):
+            # Walk horizontally; stop wherever turning vertical leads somewhere.
+            while budget[0] > 0:
+                x += dx
+                budget[0] -= 1
+                if not (0 <= x < w) or cells[x * h + y]:
+                    return None
+                if x == gx and y == gy:
+                    return (x, y)
+                if (is_open(x, y + 1) and not is_open(x - dx, y + 1)) or (
+                    is_open(x, y - 1) and not is_open(x - dx, y - 1)
+                ):
+                    return (x, y)
+                if scan_v(x, y, 1) is not None or scan_v(x, y, -1) is not None:
+                    return (x, y)
+            return None
+
+        # Arrival directions: (dx, dy); (0, 0) for the start.
+        g_score = {start: 0}
+        parent = {}
+        arrived = {start: {(0, 0)}}
+        open_heap = [(abs(sx - gx) + abs(sy - gy), 0, start)]
+        expanded = 0
+
+        while open_heap and expanded < max_nodes and budget[0] > 0:
+            _, g, node = heapq.heappop(open_heap)
+            if g > g_score[node]:
+                continue
+            dirs = arrived.pop(node, None)
+            if not dirs:
+                continue
+            expanded += 1
+
+            if node == goal:
+                path = []
+                cur = node
+                while cur != start:
+                    prev = parent[cur]
+                    # Expand the straight segment prev -> cur.
+                    step_x = (cur[0] > prev[0]) - (cur[0] < prev[0])
+                    step_y = (cur[1] > prev[1]) - (cur[1] < prev[1])
+                    x, y = cur
+                    while (x, y) != prev:
+                        path.append((x, y))
+                        x -= step_x
+                        y -= step_y
+                    cur = prev
+                path.reverse()
+                return path
+
+            x, y = node
+            succ_dirs = set()
+            for dx, dy in dirs:
+                if dx == 0 and dy == 0:
+                    succ_dirs.update(((1, 0), (-1, 0), (0, 1), (0, -1)))
+                elif dy == 0:
+                    succ_dirs.update(((dx, 0), (0, 1), (0, -1)))
+                else:
+                    succ_dirs.add((0, dy))
+                    for side in (1, -1):
+                        if is_open(x + side, y) and not is_open(x + side, y - dy):
+                            succ_dirs.add((side, 0))
+
+            for dx, dy in succ_dirs:
+                jp = scan_h(x, y, dx) if dy == 0 else scan_v(x, y, dy)
+                if jp is None:
+                    continue
+                ng = g + abs(jp[0] - x) + abs(jp[1] - y)
+                old = g_score.get(jp)
+                if old is None or ng < old:
+                    g_score[jp] = ng
+                    parent[jp] = node
+                    arrived[jp] = {(dx, dy)}
+                    heapq.heappush(open_heap, (ng + abs(jp[0] - gx) + abs(jp[1] - gy), ng, jp))
+                elif ng == old:
+                    # Same cost from another direction: expand that direction's successors too.
+                    pending = arrived.get(jp)
+                    if pending is None:
+                        arrived[jp] = {(dx, dy)}
+                        heapq.heappush(open_heap, (ng + abs(jp[0] - gx) + abs(jp[1] - gy), ng, jp))
+                    else:
+                        pending.add((dx, dy))
+
+        return []
+
+
+
+class GridSearch:
+    """BlockedGrid.astar() split into steps, like AStarSearch does for astar().
+
+    step(budget) expands at most `budget` nodes; once `done` is set, `path` holds
+    the same result BlockedGrid.astar() would have returned. An unfinished search
+    keeps its own set of the grid's stamped arrays and hands it back when it's done;
+    one that is dropped half-way just lets them go. The grid's cells must not change
+    while a search is under way.
+    """
+
+    def __init__(self, grid: BlockedGrid, start, goal, max_nodes: int = 4000):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.max_nodes = max_nodes
+
+        self.done = False
+        self.path = []
+        self.visited = 0
+
+        w = grid.w
+        h = grid.h
+        sx, sy = start
+        gx, gy = goal
+        if start == goal or not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h):
+            self.done = True
+            return
+        self._goal_i = gx * h + gy
+        if grid.cells[self._goal_i]:
+            self.done = True
+            return
+
+        self._state = grid._take_state()
+        g_score, _, seen, _, gen = self._state
+        self._start_i = sx * h + sy
+        g_score[self._start_i] = 0
+        seen[self._start_i] = gen
+        self._open_heap = [(abs(sx - gx) + abs(sy - gy), 0, self._start_i)]
+
+    def _finish(self, path):
+        self.path = path
+        self.done = True
+        self.grid._give_back_state(self._state)
+        self._state = None
+
+    def step(self, budget: int):
+        """Expand up to `budget` nodes. Returns how many were expanded."""
+        if self.done:
+            return 0
+        grid = self.grid
+        w = grid.w
+        h = grid.h
+        cells = grid.cells
+        gx, gy = self.goal
+        goal_i = self._goal_i
+        g_score, parent, seen, closed, gen = self._state
+        open_heap = self._open_heap
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        visited = self.visited
+        stop = min(self.max_nodes, visited + budget)
+
+        while open_heap and visited < stop:
+            _, g, i = heappop(open_heap)
+            visited += 1
+
+            if i == goal_i:
+                start_i = self._start_i
+                path = []
+                while i != start_i:
+                    path.append(divmod(i, h))
+                    i = parent[i]
+                path.reverse()
+                expanded = visited - self.visited
+                self.visited = visited
+                self._finish(path)
+                return expanded
+
+            # Stale heap entry: the cell was already expanded with a better score.
+            # (astar() expands it again to no effect; it still counts towards max_nodes.)
+            if closed[i] == gen:
+                continue
+            closed[i] = gen
+
+            x, y = divmod(i, h)
+            ng = g + 1
+            # Neighbours in astar()'s order: x + 1, x - 1, y + 1, y - 1.
+            if x < w - 1:
+                n = i + h
+                if not cells[n] and (seen[n] != gen or ng < g_score[n]):
+                    seen[n] = gen
+                    g_score[n] = ng
+                    parent[n] = i
+                    heappush(open_heap, (ng + abs(x + 1 - gx) + abs(y - gy), ng, n))
+            if x > 0:
+                n = i - h
+                if not cells[n] and (seen[n] != gen or ng < g_score[n]):
+                    seen[n] = gen
+                    g_score[n] = ng
+                    parent[n] = i
+                    heappush(open_heap, (ng + abs(x - 1 - gx) + abs(y - gy), ng, n))
+            if y < h - 1:
+                n = i + 1
+                if not cells[n] and (seen[n] != gen or ng < g_score[n]):
+                    seen[n] = gen
+                    g_score[n] = ng
+                    parent[n] = i
+                    heappush(open_heap, (ng + abs(x - gx) + abs(y + 1 - gy), ng, n))
+            if y > 0:
+                n = i - 1
+                if not cells[n] and (seen[n] != gen or ng < g_score[n]):
+                    seen[n] = gen
+                    g_score[n] = ng
+                    parent[n] = i
+                    heappush(open_heap, (ng + abs(x - gx) + abs(y - 1 - gy), ng, n))
+
+        expanded = visited - self.visited
+        self.visited = visited
+        if not open_heap or visited >= self.max_nodes:
+            # No path (or gave up): same empty result as astar().
+            self._finish([])
+        return expanded
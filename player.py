@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pygame
 
-from assets import load_image
+from assets import load_image, variant_cache
 
 
 class Player:
@@ -11,6 +11,22 @@ class Player:
     # - moving the player rect
     # - stopping movement when colliding with solid tiles
     # - choosing an animation frame based on direction
+
+    # Sprite files in the player assets folder.
+    WALK_FRAMES = {
+        "down": ["down0.png", "down1.png", "down2.png"],
+        "up": ["up0.png", "up1.png", "up2.png"],
+        "left": ["left0.png", "left1.png", "left2.png"],
+        "right": ["right0.png", "right1.png", "right2.png"],
+    }
+    # Attack animations. Your filenames look like: $rightattmainchar1.png, $rightattmainchar2.png, $rightattmainchar3.png
+    ATTACK_FRAMES = {
+        "down": ["$downattmainchar1.png", "$downattmainchar2.png", "$downattmainchar3.png"],
+        "up": ["$upattmainchar1.png", "$upattmainchar2.png", "$upattmainchar3.png"],
+        "left": ["$leftattmainchar1.png", "$leftattmainchar2.png", "$leftattmainchar3.png"],
+        "right": ["$rightattmainchar1.png", "$rightattmainchar2.png", "$rightattmainchar3.png"],
+    }
+
     def __init__(self, pos_px, tile_size: int, assets_dir: Path, scale: int = 1):
         self.tile_size = tile_size
         self.scale = scale
@@ -50,67 +66,28 @@ class Player:
         self._anim_t = 0.0
         self._anim_i = 0
 
-        # Load 3 frames for each direction.
+        self.key_state = None
+
+        # Load 3 frames for each direction (walk) and 3 attack frames per direction.
+        # Pixel-art friendly scaling: load_image scales by an integer factor, keeping original proportions
+        # (attack frames are wider than 16x16, so we must NOT force them into a square).
         # If a file is missing, load_image returns a placeholder so the game still runs.
         self.frames = {
-            "down": [
-                load_image(assets_dir / "down0.png"),
-                load_image(assets_dir / "down1.png"),
-                load_image(assets_dir / "down2.png"),
-            ],
-            "up": [
-                load_image(assets_dir / "up0.png"),
-                load_image(assets_dir / "up1.png"),
-                load_image(assets_dir / "up2.png"),
-            ],
-            "left": [
-                load_image(assets_dir / "left0.png"),
-                load_image(assets_dir / "left1.png"),
-                load_image(assets_dir / "left2.png"),
-            ],
-            "right": [
-                load_image(assets_dir / "right0.png"),
-                load_image(assets_dir / "right1.png"),
-                load_image(assets_dir / "right2.png"),
-            ],
+            d: [load_image(assets_dir / name, scale=self.scale) for name in names] for d, names in self.WALK_FRAMES.items()
         }
-
-        # Attack animations (3 frames each direction).
-        # Your filenames look like: $rightattmainchar1.png, $rightattmainchar2.png, $rightattmainchar3.png
         self.attack_frames = {
-            "down": [
-                load_image(assets_dir / "$downattmainchar1.png"),
-                load_image(assets_dir / "$downattmainchar2.png"),
-                load_image(assets_dir / "$downattmainchar3.png"),
-            ],
-            "up": [
-                load_image(assets_dir / "$upattmainchar1.png"),
-                load_image(assets_dir / "$upattmainchar2.png"),
-                load_image(assets_dir / "$upattmainchar3.png"),
-            ],
-            "left": [
-                load_image(assets_dir / "$leftattmainchar1.png"),
-                load_image(assets_dir / "$leftattmainchar2.png"),
-                load_image(assets_dir / "$leftattmainchar3.png"),
-            ],
-            "right": [
-                load_image(assets_dir / "$rightattmainchar1.png"),
-                load_image(assets_dir / "$rightattmainchar2.png"),
-                load_image(assets_dir / "$rightattmainchar3.png"),
-            ],
+            d: [load_image(assets_dir / name, scale=self.scale) for name in names]
+            for d, names in self.ATTACK_FRAMES.items()
         }
 
-        for k, imgs in self.frames.items():
-            # Pixel-art friendly scaling: keep original proportions and scale by an integer factor.
-            self.frames[k] = [
-                pygame.transform.scale(i, (i.get_width() * self.scale, i.get_height() * self.scale)) for i in imgs
-            ]
-
-        for k, imgs in self.attack_frames.items():
-            # Attack frames are wider than 16x16, so we must NOT force them into a square.
-            self.attack_frames[k] = [
-                pygame.transform.scale(i, (i.get_width() * self.scale, i.get_height() * self.scale)) for i in imgs
-            ]
+    @classmethod
+    def image_paths(cls, assets_dir: Path):
+        """Every sprite file a Player loads (used to preload assets)."""
+        paths = []
+        for frames in (cls.WALK_FRAMES, cls.ATTACK_FRAMES):
+            for names in frames.values():
+                paths.extend(assets_dir / name for name in names)
+        return paths
 
     def current_image(self):
         if self.attacking:
@@ -135,9 +112,7 @@ class Player:
         # Retro flicker: alternate visibility/alpha.
         if int(self._invuln_t * 20) % 2 == 0:
             return None
-        temp = img.copy()
-        temp.set_alpha(140)
-        return temp
+        return variant_cache.with_alpha(img, 140, effect="flash")
 
     def get_draw_pos(self):
         # Convert hitbox position to sprite position.
@@ -176,6 +151,12 @@ class Player:
             y = self.rect.bottom - img.get_height()
         return x, y
 
+    def get_draw_rect(self):
+        # World-space area covered by the current sprite.
+        x, y = self.get_draw_pos()
+        img = self.current_image()
+        return pygame.Rect(x, y, img.get_width(), img.get_height())
+
     def start_attack(self):
         # Start an attack if we're not already attacking and the cooldown is finished.
         if self.attacking or self._attack_cd_t > 0:
@@ -209,7 +190,8 @@ class Player:
 
     def handle_input(self):
         # Convert keyboard state into a direction vector (-1/0/1 on x/y).
-        keys = pygame.key.get_pressed()
+        # `key_state` (an InputState) replaces the real keyboard when input is injected (headless runs).
+        keys = self.key_state if self.key_state is not None else pygame.key.get_pressed()
         dx = 0
         dy = 0
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
@@ -0,0 +1,205 @@
+"""Per-frame phase profiler.
+
+GamePanel wraps each part of a frame in a named timer:
+
+    with gp.profiler.phase("monsters"):
+        ...
+
+Timings are summed per frame (a frame can run several fixed-timestep updates, or
+draw the scene once per dirty rect) and pushed into a ring buffer by end_frame().
+Phases can nest: while an inner phase runs the outer one is paused, so each
+phase only books its own time (e.g. a map fade drawn from inside "player").
+Counters (e.g. how many monsters are in each activity tier) are set with
+count(name, value) and recorded with each frame.
+F3 toggles an overlay with a frame-time graph and per-phase averages / p99s;
+`python main.py --profile-csv frames.csv` writes the buffer out when the game exits.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from collections import deque
+from pathlib import Path
+
+import pygame
+
+
+PHASES = (
+    "input",
+    "player",
+    "monsters",  # includes A* repaths
+    "contact",  # contact damage, push-out, attack hits and knockback
+    "drops",
+    "world_draw",
+    "entity_draw",
+    "ui",
+    "present",
+    "fade",  # map transition fades (their scene render is booked to world_draw / entity_draw)
+)
+
+# Frame-time budget drawn as a line on the graph (60 FPS).
+BUDGET_MS = 1000.0 / 60.0
+
+
+class _PhaseTimer:
+    # Reusable context manager: one per phase, so timing a phase allocates nothing.
+    __slots__ = ("_profiler", "_index", "_t0")
+
+    def __init__(self, profiler: FrameProfiler, index: int):
+        self._profiler = profiler
+        self._index = index
+        self._t0 = 0.0
+
+    def __enter__(self):
+        now = time.perf_counter()
+        profiler = self._profiler
+        open_timers = profiler._open
+        if open_timers:
+            # Pause the enclosing phase until this one exits.
+            outer = open_timers[-1]
+            profiler._current[outer._index] += now - outer._t0
+        open_timers.append(self)
+        self._t0 = now
+        return self
+
+    def __exit__(self, *exc):
+        now = time.perf_counter()
+        profiler = self._profiler
+        profiler._current[self._index] += now - self._t0
+        open_timers = profiler._open
+        open_timers.pop()
+        if open_timers:
+            open_timers[-1]._t0 = now
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 600, phases=PHASES):
+        self.phases = tuple(phases)
+        self.capacity = capacity
+
+        # Ring buffer of (frame_ms, (phase_ms, ...), {counter: value}).
+        self.frames: deque = deque(maxlen=capacity)
+        self.frame_count = 0
+
+        self._timers = {name: _PhaseTimer(self, i) for i, name in enumerate(self.phases)}
+        self._current = [0.0] * len(self.phases)
+        # Phases currently entered, innermost last.
+        self._open: list[_PhaseTimer] = []
+        self._frame_t0 = time.perf_counter()
+        self.counter_names: list[str] = []
+        self._counts: dict[str, int] = {}
+
+        self._font = None
+        self._panel = None
+        self._lines: list[list[pygame.Surface]] = []
+        self._lines_frame = -1
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+
+    def phase(self, name: str):
+        return self._timers[name]
+
+    def count(self, name: str, value: int):
+        """Set a counter; its latest value is recorded with every frame from now on."""
+        if name not in self._counts:
+            self.counter_names.append(name)
+        self._counts[name] = value
+
+    def end_frame(self):
+        """Close the current frame: record its wall time, phase totals and counters."""
+        now = time.perf_counter()
+        self.frames.append(
+            ((now - self._frame_t0) * 1000.0, tuple(t * 1000.0 for t in self._current), dict(self._counts))
+        )
+        self.frame_count += 1
+        self._frame_t0 = now
+        self._current = [0.0] * len(self.phases)
+
+    # ------------------------------------------------------------------
+    # statistics / export
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _p99(values):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def summary(self):
+        """{name: (avg_ms, p99_ms)} over the buffered frames, with "frame" for the wall time."""
+        stats = {}
+        frame_times = [f[0] for f in self.frames]
+        n = len(frame_times) or 1
+        stats["frame"] = (sum(frame_times) / n, self._p99(frame_times))
+        for i, name in enumerate(self.phases):
+            values = [f[1][i] for f in self.frames]
+            stats[name] = (sum(values) / n, self._p99(values))
+        return stats
+
+    def dump_csv(self, path: Path):
+        """Write the buffered frames (oldest first), one row per frame, times in ms."""
+        path = Path(path)
+        first = self.frame_count - len(self.frames)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms", *(f"{name}_ms" for name in self.phases), *self.counter_names])
+            for i, (frame_ms, phase_ms, counts) in enumerate(self.frames):
+                writer.writerow(
+                    [
+                        first + i,
+                        f"{frame_ms:.3f}",
+                        *(f"{ms:.3f}" for ms in phase_ms),
+                        *(counts.get(name, "") for name in self.counter_names),
+                    ]
+                )
+
+    # ------------------------------------------------------------------
+    # overlay
+    # ------------------------------------------------------------------
+    def draw(self, screen: pygame.Surface, graph_frames: int = 240):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        font = self._font
+        line_h = 16
+        graph_h = 60
+        width = graph_frames + 20
+        height = 10 + graph_h + 8 + line_h * (len(self.phases) + 2 + len(self.counter_names)) + 6
+
+        x = screen.get_width() - width - 10
+        y = 10
+        self.overlay_rect = pygame.Rect(x, y, width, height)
+
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self._panel.fill((0, 0, 0, 170))
+        screen.blit(self._panel, (x, y))
+
+        # Frame-time graph: one bar per frame, scaled so two budgets fill the graph.
+        gx = x + 10
+        gy = y + 10
+        scale = graph_h / (BUDGET_MS * 2.0)
+        recent = list(self.frames)[-graph_frames:]
+        for i, (frame_ms, _, _) in enumerate(recent):
+            bar_h = min(graph_h, max(1, int(frame_ms * scale)))
+            color = (90, 200, 90) if frame_ms <= BUDGET_MS * 1.05 else (230, 80, 60)
+            pygame.draw.line(screen, color, (gx + i, gy + graph_h), (gx + i, gy + graph_h - bar_h))
+        budget_y = gy + graph_h - int(BUDGET_MS * scale)
+        pygame.draw.line(screen, (200, 200, 200), (gx, budget_y), (gx + graph_frames, budget_y))
+
+        # Per-phase averages and p99s, re-rendered a few times per second so they stay readable.
+        if not self._lines or self.frame_count - self._lines_frame >= 15:
+            self._lines = [(("phase", "avg ms", "p99 ms"), (255, 255, 255))]
+            for name, (avg, p99) in self.summary().items():
+                self._lines.append(((name, f"{avg:.2f}", f"{p99:.2f}"), (220, 220, 220)))
+            for name in self.counter_names:
+                self._lines.append(((name, str(self._counts[name]), ""), (160, 200, 255)))
+            self._lines = [[font.render(cell, True, color) for cell in cells] for cells, color in self._lines]
+            self._lines_frame = self.frame_count
+        ty = gy + graph_h + 8
+        for name_surf, avg_surf, p99_surf in self._lines:
+            screen.blit(name_surf, (gx, ty))
+            # Numbers are right-aligned in their columns.
+            screen.blit(avg_surf, (gx + 150 - avg_surf.get_width(), ty))
+            screen.blit(p99_surf, (gx + 220 - p99_surf.get_width(), ty))
+            ty += line_h
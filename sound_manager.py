@@ -4,8 +4,23 @@ import pygame
 
 
 class SoundManager:
-    def __init__(self, sound_dir: Path):
+    # Sound effect attribute -> file. __init__ loads these; GamePanel
+    # preloads the same files.
+    SFX_FILES = {
+        "sfx_swing": "weapon_swing01.wav",
+        "sfx_damage": "receivedamage.wav",
+        "sfx_hitmonster": "hitmonster.wav",
+        "sfx_gameover": "gameover1.wav",
+        "sfx_pickup": "pickupitem0.wav",
+        "sfx_treasure": "treasure1.wav",
+        "sfx_door": "undoor1.wav",
+        "sfx_fanfare": "fanfare.wav",
+    }
+
+    def __init__(self, sound_dir: Path, preloaded: dict[Path, pygame.mixer.Sound | None] | None = None):
         self.sound_dir = sound_dir
+        # Sounds already decoded elsewhere (see asset_loader.py), keyed by path.
+        self._preloaded = preloaded or {}
 
         try:
             if not pygame.mixer.get_init():
@@ -13,17 +28,13 @@ class SoundManager:
         except Exception:
             pass
 
-        self.sfx_swing = self._load_sound("weapon_swing01.wav")
-        self.sfx_damage = self._load_sound("receivedamage.wav")
-        self.sfx_hitmonster = self._load_sound("hitmonster.wav")
-        self.sfx_gameover = self._load_sound("gameover1.wav")
-        self.sfx_pickup = self._load_sound("pickupitem0.wav")
-        self.sfx_treasure = self._load_sound("treasure1.wav")
-        self.sfx_door = self._load_sound("undoor1.wav")
-        self.sfx_fanfare = self._load_sound("fanfare.wav")
+        for attr, name in self.SFX_FILES.items():
+            setattr(self, attr, self._load_sound(name))
 
     def _load_sound(self, name: str):
         path = self.sound_dir / name
+        if path in self._preloaded:
+            return self._preloaded[path]
         try:
             return pygame.mixer.Sound(path)
         except Exception:
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid of cell_size x cell_size cells, each listing the entities whose rect overlaps it.
+
+    GamePanel keeps one with tile-sized cells for the monsters, so contact damage,
+    push-out, attack hits and aggro checks look at the few monsters near the player
+    instead of all of them. move() is called after an entity moves and only touches
+    the cell lists when its rect crossed into other cells.
+
+    Queries return candidates (entities in the overlapped cells) in insertion
+    order, so results come out in the same order as the list they were added from;
+    callers still do their exact rect / distance test.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list] = {}
+        # entity -> (x0, y0, x1, y1) cell range it is listed in.
+        self._ranges: dict[object, tuple[int, int, int, int]] = {}
+        self._order: dict[object, int] = {}
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, entity):
+        return entity in self._ranges
+
+    def _range(self, rect: pygame.Rect):
+        cs = self.cell_size
+        return rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs
+
+    def _link(self, entity, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self._cells.setdefault((cx, cy), []).append(entity)
+
+    def _unlink(self, entity, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells[(cx, cy)]
+                bucket.remove(entity)
+                if not bucket:
+                    del self._cells[(cx, cy)]
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+        self._order.clear()
+        self._next_order = 0
+
+    def insert(self, entity, rect: pygame.Rect):
+        if entity in self._ranges:
+            self.move(entity, rect)
+            return
+        cells = self._range(rect)
+        self._ranges[entity] = cells
+        self._order[entity] = self._next_order
+        self._next_order += 1
+        self._link(entity, cells)
+
+    def move(self, entity, rect: pygame.Rect):
+        """Re-file `entity` under `rect` (inserting it if it's new)."""
+        old = self._ranges.get(entity)
+        if old is None:
+            self.insert(entity, rect)
+            return
+        cells = self._range(rect)
+        if cells != old:
+            self._unlink(entity, old)
+            self._link(entity, cells)
+            self._ranges[entity] = cells
+
+    def remove(self, entity):
+        cells = self._ranges.pop(entity, None)
+        if cells is not None:
+            self._unlink(entity, cells)
+            del self._order[entity]
+
+    def query_rect(self, rect: pygame.Rect):
+        """Entities listed in any cell `rect` overlaps (each once), in insertion order."""
+        x0, y0, x1, y1 = self._range(rect)
+        cells = self._cells
+        found = {}
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        for entity in bucket:
+                            found[entity] = None
+        else:
+            # Big area, few occupied cells (e.g. an aggro radius): walk the occupied cells instead.
+            for (cx, cy), bucket in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    for entity in bucket:
+                        found[entity] = None
+        if len(found) > 1:
+            return self.in_order(found)
+        return list(found)
+
+    def in_order(self, entities):
+        """`entities` (all in the hash) sorted by insertion order."""
+        return sorted(entities, key=self._order.__getitem__)
+
+    def query_radius(self, center, radius: float):
+        """Candidates for entities within `radius` of `center`: those in the cells of its bounding square."""
+        cx, cy = int(center[0]), int(center[1])
+        r = int(radius) + 1
+        return self.query_rect(pygame.Rect(cx - r, cy - r, 2 * r + 1, 2 * r + 1))
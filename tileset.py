@@ -1,216 +1,98 @@
 from pathlib import Path
-from tarfile import XHDTYPE
 
 import pygame
 
 from assets import load_image
 
 
-class TileSet:
-    def __init__(self, tiles_dir: Path, display_scale: int):
-        self.display_scale = display_scale
+# Tile manifest: map symbol -> file in tiles/ (numbered 000.png ... 037.png).
+# These defaults are picked to look reasonable with the provided set.
+TILE_MANIFEST: dict[str, str] = {
+    ".": "001.png",  # grass
+    "V": "000.png",  # void
+    "~": "018.png",  # water
+    "#": "032.png",  # wall
+    "T": "016.png",  # tree
+    "1": "020.png",  # water corner 1
+    "2": "021.png",  # water center up
+    "3": "022.png",  # water corner 2
+    "4": "024.png",  # water center right
+    "5": "027.png",  # water corner 3
+    "6": "026.png",  # water center down
+    "7": "025.png",  # water corner 4
+    "8": "023.png",  # water center left
+    "9": "003.png",  # road
+    "A": "015.png",  # road corner 1
+    "B": "005.png",  # road center up
+    "C": "012.png",  # road corner 2
+    "D": "008.png",  # road center right
+    "E": "013.png",  # road corner 3
+    "F": "010.png",  # road center down
+    "G": "014.png",  # road corner 4
+    "H": "007.png",  # road center left
+    "I": "028.png",  # water external corner 1
+    "J": "029.png",  # water external corner 2
+    "K": "031.png",  # water external corner 3
+    "L": "030.png",  # water external corner 4
+    "M": "017.png",  # dirt ground
+    "N": "034.png",  # wood floor
+    "u": "037.png",  # stairs up
+    "d": "036.png",  # stairs down
+}
 
-        self.tiles = []
-        self.tile_paths = []
-        for i in range(38):
-            name = f"{i:03d}.png"
-            p = tiles_dir / name
-            self.tile_paths.append(p)
-            img = load_image(p)
-            self.tiles.append(
-                pygame.transform.scale(
-                    img,
-                    (img.get_width() * display_scale, img.get_height() * display_scale),
-                )
-            )
+# Unknown symbols are drawn with this tile.
+DEFAULT_SYMBOL = "."
 
-        # New tileset uses numbered files (000.png ... 037.png).
-        # These defaults are picked to look reasonable with the provided set.
-        void = load_image(tiles_dir / "000.png")
-        grass = load_image(tiles_dir / "001.png")
-        water = load_image(tiles_dir / "018.png")
-        wall = load_image(tiles_dir / "032.png")
-        tree = load_image(tiles_dir / "016.png")
-        water_corner1 = load_image(tiles_dir / "020.png")
-        water_center_up = load_image(tiles_dir / "021.png")
-        water_corner2 = load_image(tiles_dir / "022.png")
-        water_center_right = load_image(tiles_dir / "024.png")
-        water_corner3 = load_image(tiles_dir / "027.png")
-        water_center_down = load_image(tiles_dir / "026.png")
-        water_corner4 = load_image(tiles_dir / "025.png")
-        water_center_left = load_image(tiles_dir / "023.png")
-        road = load_image(tiles_dir / "003.png")
-        road_corner1 = load_image(tiles_dir / "015.png")
-        road_center_up = load_image(tiles_dir / "005.png")
-        road_corner2 = load_image(tiles_dir / "012.png")
-        road_center_right = load_image(tiles_dir / "008.png")
-        road_corner3 = load_image(tiles_dir / "013.png")
-        road_center_down = load_image(tiles_dir / "010.png")
-        road_corner4 = load_image(tiles_dir / "014.png")
-        road_center_left = load_image(tiles_dir / "007.png")
-        water_external_corner1 = load_image(tiles_dir / "028.png")
-        water_external_corner2 = load_image(tiles_dir / "029.png")
-        water_external_corner3 = load_image(tiles_dir / "031.png")
-        water_external_corner4 = load_image(tiles_dir / "030.png")
-        dirt_ground = load_image(tiles_dir / "017.png")
-        wood_floor = load_image(tiles_dir / "034.png")
-        stairs_up = load_image(tiles_dir / "037.png")
-        stairs_down = load_image(tiles_dir / "036.png")
 
-        self.tile_grass = pygame.transform.scale(
-            grass,
-            (grass.get_width() * display_scale, grass.get_height() * display_scale),
-        )
-        self.tile_void = pygame.transform.scale(
-            void,
-            (void.get_width() * display_scale, void.get_height() * display_scale),
-        )
-        self.tile_water = pygame.transform.scale(
-            water,
-            (water.get_width() * display_scale, water.get_height() * display_scale),
-        )
-        self.tile_wall = pygame.transform.scale(
-            wall,
-            (wall.get_width() * display_scale, wall.get_height() * display_scale),
-        )
-        self.tile_tree = pygame.transform.scale(
-            tree,
-            (tree.get_width() * display_scale, tree.get_height() * display_scale),
-        )
-        self.tile_water_corner1 = pygame.transform.scale(
-            water_corner1,
-            (water_corner1.get_width() * display_scale, water_corner1.get_height() * display_scale),
-        )
-        self.tile_water_center_up = pygame.transform.scale(
-            water_center_up,
-            (water_center_up.get_width() * display_scale, water_center_up.get_height() * display_scale),
-        )
-        self.tile_water_corner2 = pygame.transform.scale(
-            water_corner2,
-            (water_corner2.get_width() * display_scale, water_corner2.get_height() * display_scale),
-        )
-        self.tile_water_center_right = pygame.transform.scale(
-            water_center_right,
-            (water_center_right.get_width() * display_scale, water_center_right.get_height() * display_scale),
-        )
-        self.tile_water_corner3 = pygame.transform.scale(
-            water_corner3,
-            (water_corner3.get_width() * display_scale, water_corner3.get_height() * display_scale),
-        )
-        self.tile_water_center_down = pygame.transform.scale(
-            water_center_down,
-            (water_center_down.get_width() * display_scale, water_center_down.get_height() * display_scale),
-        )
-        self.tile_water_corner4 = pygame.transform.scale(
-            water_corner4,
-            (water_corner4.get_width() * display_scale, water_corner4.get_height() * display_scale),
-        )
-        self.tile_water_center_left = pygame.transform.scale(
-            water_center_left,
-            (water_center_left.get_width() * display_scale, water_center_left.get_height() * display_scale),
-        )
-        self.tile_road = pygame.transform.scale(
-            road,
-            (road.get_width() * display_scale, road.get_height() * display_scale),
-        )
-        self.tile_road_corner1 = pygame.transform.scale(
-            road_corner1,
-            (road_corner1.get_width() * display_scale, road_corner1.get_height() * display_scale),
-        )
-        self.tile_road_center_up = pygame.transform.scale(
-            road_center_up,
-            (road_center_up.get_width() * display_scale, road_center_up.get_height() * display_scale),
-        )
-        self.tile_road_corner2 = pygame.transform.scale(
-            road_corner2,
-            (road_corner2.get_width() * display_scale, road_corner2.get_height() * display_scale),
-        )
-        self.tile_road_center_right = pygame.transform.scale(
-            road_center_right,
-            (road_center_right.get_width() * display_scale, road_center_right.get_height() * display_scale),
-        )
-        self.tile_road_corner3 = pygame.transform.scale(
-            road_corner3,
-            (road_corner3.get_width() * display_scale, road_corner3.get_height() * display_scale),
-        )
-        self.tile_road_center_down = pygame.transform.scale(
-            road_center_down,
-            (road_center_down.get_width() * display_scale, road_center_down.get_height() * display_scale),
-        )
-        self.tile_road_corner4 = pygame.transform.scale(
-            road_corner4,
-            (road_corner4.get_width() * display_scale, road_corner4.get_height() * display_scale),
-        )
-        self.tile_road_center_left = pygame.transform.scale(
-            road_center_left,
-            (road_center_left.get_width() * display_scale, road_center_left.get_height() * display_scale),
-        )
-        self.tile_water_external_corner1 = pygame.transform.scale(
-            water_external_corner1,
-            (water_external_corner1.get_width() * display_scale, water_external_corner1.get_height() * display_scale),
-        )
-        self.tile_water_external_corner2 = pygame.transform.scale(
-            water_external_corner2,
-            (water_external_corner2.get_width() * display_scale, water_external_corner2.get_height() * display_scale),
-        )
-        self.tile_water_external_corner3 = pygame.transform.scale(
-            water_external_corner3,
-            (water_external_corner3.get_width() * display_scale, water_external_corner3.get_height() * display_scale),
-        )
-        self.tile_water_external_corner4 = pygame.transform.scale(
-            water_external_corner4,
-            (water_external_corner4.get_width() * display_scale, water_external_corner4.get_height() * display_scale),
-        )
-        self.tile_dirt_ground = pygame.transform.scale(
-            dirt_ground,
-            (dirt_ground.get_width() * display_scale, dirt_ground.get_height() * display_scale),
-        )
-        self.tile_wood_floor = pygame.transform.scale(
-            wood_floor,
-            (wood_floor.get_width() * display_scale, wood_floor.get_height() * display_scale),
-        ) 
-        self.tile_stairs_up = pygame.transform.scale(
-            stairs_up,
-            (stairs_up.get_width() * display_scale, stairs_up.get_height() * display_scale),
-        )
-        self.tile_stairs_down = pygame.transform.scale(
-            stairs_down,
-            (stairs_down.get_width() * display_scale, stairs_down.get_height() * display_scale),
-        )
-        self.images = {
-            ".": self.tile_grass,
-            "V": self.tile_void,
-            "~": self.tile_water,
-            "#": self.tile_wall,
-            "T": self.tile_tree,
-            "1": self.tile_water_corner1,
-            "2": self.tile_water_center_up,
-            "3": self.tile_water_corner2,
-            "4": self.tile_water_center_right,
-            "5": self.tile_water_corner3,
-            "6": self.tile_water_center_down,
-            "7": self.tile_water_corner4,
-            "8": self.tile_water_center_left,
-            "9": self.tile_road,
-            "A": self.tile_road_corner1,
-            "B": self.tile_road_center_up,
-            "C": self.tile_road_corner2,
-            "D": self.tile_road_center_right,
-            "E": self.tile_road_corner3,
-            "F": self.tile_road_center_down,
-            "G": self.tile_road_corner4,
-            "H": self.tile_road_center_left,
-            "I": self.tile_water_external_corner1,
-            "J": self.tile_water_external_corner2,
-            "K": self.tile_water_external_corner3,
-            "L": self.tile_water_external_corner4,
-            "M": self.tile_dirt_ground,
-            "N": self.tile_wood_floor,
-            "u": self.tile_stairs_up,
-            "d": self.tile_stairs_down,
-        }
+class TileSet:
+    # Tiles are loaded lazily: a symbol's image is loaded (and scaled) the first time
+    # image_for() asks for it, so memory and startup scale with what the maps use.
+    def __init__(self, tiles_dir: Path, display_scale: int, manifest: dict[str, str] | None = None):
+        self.tiles_dir = tiles_dir
+        self.display_scale = display_scale
+        self.manifest = dict(TILE_MANIFEST if manifest is None else manifest)
+
+        # Resident tiles by symbol (filled on demand).
+        self.images: dict[str, pygame.Surface] = {}
+        self.loads = 0
 
         self.solid_tiles = {"#", "~", "V", "T", "1", "2", "3", "4", "5", "6", "7", "8", "I", "J", "K", "L"}
 
     def image_for(self, symbol: str):
-        return self.images.get(symbol, self.tile_grass)
\ No newline at end of file
+        img = self.images.get(symbol)
+        if img is not None:
+            return img
+
+        file_name = self.manifest.get(symbol)
+        if file_name is None:
+            # Unknown symbol: share the default tile (and remember it so we only look it up once).
+            if symbol == DEFAULT_SYMBOL:
+                file_name = TILE_MANIFEST[DEFAULT_SYMBOL]
+            else:
+                img = self.image_for(DEFAULT_SYMBOL)
+                self.images[symbol] = img
+                return img
+
+        img = load_image(self.tiles_dir / file_name, scale=self.display_scale)
+        self.loads += 1
+        self.images[symbol] = img
+        return img
+
+    def paths_for(self, symbols):
+        """Tile files needed to draw `symbols` (used to preload assets)."""
+        names = {self.manifest.get(s, TILE_MANIFEST[DEFAULT_SYMBOL]) for s in set(symbols)}
+        return [self.tiles_dir / name for name in sorted(names)]
+
+    def preload(self, symbols):
+        """Load the tiles for `symbols` now (e.g. every symbol of a map before it is shown)."""
+        for symbol in set(symbols):
+            self.image_for(symbol)
+
+    def stats(self):
+        files = {self.manifest.get(s, TILE_MANIFEST[DEFAULT_SYMBOL]) for s in self.images}
+        return {
+            "resident_symbols": len(self.images),
+            "resident_files": len(files),
+            "manifest_symbols": len(self.manifest),
+            "loads": self.loads,
+        }
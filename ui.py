@@ -1,71 +1,128 @@
+from collections import OrderedDict
+
 import pygame
 
 
+class TextCache:
+    # Rendered text surfaces keyed by (font, string, colour).
+    # Most UI strings never change, so font rasterisation only happens the first time.
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple[int, int, int]):
+        key = (font, text, color)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._entries[key] = surf
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+
+# Shared by every UI screen.
+text_cache = TextCache()
+
+
 class UI:
     def __init__(self):
         self.font = pygame.font.Font(None, 22)
 
+        # Retained layouts: lists of (surface, position), rebuilt only when their inputs change.
+        self._hud_key = None
+        self._hud_blits = []
+        self._inventory_key = None
+        self._inventory_blits = []
+        self._victory_key = None
+        self._victory_blits = []
+        self._overlays: dict[tuple[int, int, int], pygame.Surface] = {}
+
+    def _text(self, text: str, color: tuple[int, int, int]):
+        return text_cache.render(self.font, text, color)
+
+    def _overlay(self, screen_w: int, screen_h: int, alpha: int):
+        key = (screen_w, screen_h, alpha)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))
+            self._overlays[key] = overlay
+        return overlay
+
     def draw_hud(self, screen: pygame.Surface, player_hp: int, player_max_hp: int):
-        hud1 = self.font.render("WASD/Arrows move | Shift run | Esc quit", True, (255, 255, 255))
-        hud2 = self.font.render("E inventory | X interact/open | 1 use potion | Space attack", True, (255, 255, 255))
-        screen.blit(hud1, (10, 10))
-        screen.blit(hud2, (10, 32))
+        key = (player_hp, player_max_hp)
+        if key != self._hud_key:
+            hud1 = self._text("WASD/Arrows move | Shift run | Esc quit", (255, 255, 255))
+            hud2 = self._text("E inventory | X interact/open | 1 use potion | Space attack", (255, 255, 255))
+            hp_text = self._text(f"HP: {player_hp}/{player_max_hp}", (255, 255, 255))
+            self._hud_blits = [(hud1, (10, 10)), (hud2, (10, 32)), (hp_text, (10, 54))]
+            self._hud_key = key
 
-        hp_text = self.font.render(f"HP: {player_hp}/{player_max_hp}", True, (255, 255, 255))
-        screen.blit(hp_text, (10, 54))
+        screen.blits(self._hud_blits, doreturn=False)
 
     def draw_game_over(self, screen: pygame.Surface, screen_w: int, screen_h: int):
-        go1 = self.font.render("GAME OVER", True, (255, 80, 80))
-        go2 = self.font.render("Press R to restart", True, (255, 255, 255))
+        go1 = self._text("GAME OVER", (255, 80, 80))
+        go2 = self._text("Press R to restart", (255, 255, 255))
         screen.blit(go1, (screen_w // 2 - go1.get_width() // 2, screen_h // 2 - 24))
         screen.blit(go2, (screen_w // 2 - go2.get_width() // 2, screen_h // 2 + 2))
 
     def draw_victory(self, screen: pygame.Surface, screen_w: int, screen_h: int, monsters_killed: int, coins_collected: int):
-        overlay = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
-        
-        title = self.font.render("VICTORY!", True, (80, 200, 255))
-        subtitle = self.font.render("You found the Blue Heart!", True, (255, 255, 255))
-        
-        score_title = self.font.render("--- Final Score ---", True, (220, 220, 220))
-        monsters_text = self.font.render(f"Monsters Defeated: {monsters_killed}", True, (255, 200, 100))
-        coins_text = self.font.render(f"Coins Collected: {coins_collected}", True, (255, 215, 0))
-        
-        restart = self.font.render("Press R to play again", True, (200, 200, 200))
-        
-        y_start = screen_h // 2 - 80
-        screen.blit(title, (screen_w // 2 - title.get_width() // 2, y_start))
-        screen.blit(subtitle, (screen_w // 2 - subtitle.get_width() // 2, y_start + 30))
-        screen.blit(score_title, (screen_w // 2 - score_title.get_width() // 2, y_start + 70))
-        screen.blit(monsters_text, (screen_w // 2 - monsters_text.get_width() // 2, y_start + 100))
-        screen.blit(coins_text, (screen_w // 2 - coins_text.get_width() // 2, y_start + 125))
-        screen.blit(restart, (screen_w // 2 - restart.get_width() // 2, y_start + 165))
+        screen.blit(self._overlay(screen_w, screen_h, 200), (0, 0))
+
+        key = (screen_w, screen_h, monsters_killed, coins_collected)
+        if key != self._victory_key:
+            lines = [
+                (self._text("VICTORY!", (80, 200, 255)), 0),
+                (self._text("You found the Blue Heart!", (255, 255, 255)), 30),
+                (self._text("--- Final Score ---", (220, 220, 220)), 70),
+                (self._text(f"Monsters Defeated: {monsters_killed}", (255, 200, 100)), 100),
+                (self._text(f"Coins Collected: {coins_collected}", (255, 215, 0)), 125),
+                (self._text("Press R to play again", (200, 200, 200)), 165),
+            ]
+            y_start = screen_h // 2 - 80
+            self._victory_blits = [
+                (surf, (screen_w // 2 - surf.get_width() // 2, y_start + dy)) for surf, dy in lines
+            ]
+            self._victory_key = key
+
+        screen.blits(self._victory_blits, doreturn=False)
 
     def draw_paused(self, screen: pygame.Surface, screen_w: int, screen_h: int):
-        p1 = self.font.render("PAUSED", True, (255, 255, 255))
-        p2 = self.font.render("Press P to resume", True, (255, 255, 255))
+        p1 = self._text("PAUSED", (255, 255, 255))
+        p2 = self._text("Press P to resume", (255, 255, 255))
         screen.blit(p1, (screen_w // 2 - p1.get_width() // 2, screen_h // 2 - 24))
         screen.blit(p2, (screen_w // 2 - p2.get_width() // 2, screen_h // 2 + 2))
 
     def draw_inventory(self, screen: pygame.Surface, screen_w: int, screen_h: int, inventory: dict[str, int]):
-        overlay = pygame.Surface((screen_w, screen_h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 170))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self._overlay(screen_w, screen_h, 170), (0, 0))
+
+        key = (screen_w, screen_h, tuple(inventory.items()))
+        if key != self._inventory_key:
+            title = self._text("INVENTORY (E to close)", (255, 255, 255))
+            blits = [(title, (screen_w // 2 - title.get_width() // 2, 60))]
 
-        title = self.font.render("INVENTORY (E to close)", True, (255, 255, 255))
-        screen.blit(title, (screen_w // 2 - title.get_width() // 2, 60))
+            if not inventory:
+                empty = self._text("(empty)", (220, 220, 220))
+                blits.append((empty, (screen_w // 2 - empty.get_width() // 2, 92)))
+            else:
+                y = 92
+                for name, count in inventory.items():
+                    line = self._text(f"{name}: {count}", (220, 220, 220))
+                    blits.append((line, (screen_w // 2 - line.get_width() // 2, y)))
+                    y += 22
 
-        if not inventory:
-            empty = self.font.render("(empty)", True, (220, 220, 220))
-            screen.blit(empty, (screen_w // 2 - empty.get_width() // 2, 92))
-            return
+            self._inventory_blits = blits
+            self._inventory_key = key
 
-        y = 92
-        for name, count in inventory.items():
-            line = self.font.render(f"{name}: {count}", True, (220, 220, 220))
-            screen.blit(line, (screen_w // 2 - line.get_width() // 2, y))
-            y += 22
+        screen.blits(self._inventory_blits, doreturn=False)
 
     def draw(
         self,
@@ -90,4 +147,4 @@ class UI:
         if paused:
             self.draw_paused(screen, screen_w, screen_h)
         if inventory_open:
-            self.draw_inventory(screen, screen_w, screen_h, inventory)
\ No newline at end of file
+            self.draw_inventory(screen, screen_w, screen_h, inventory)
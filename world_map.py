@@ -1,9 +1,71 @@
+from collections import OrderedDict
+
 import pygame
 
-from pathfinding import inflate_blocked
+from hpa import HierarchicalPathfinder
+from path_cache import PathCache
+from pathfinding import BlockedGrid, inflate_blocked
+
+
+class ObjectLayer(dict):
+    # A normal {(tx, ty): symbol} dict that reports every tile it changes.
+    # The game mutates `world.objects` directly (chests, doors, drops, pickups),
+    # so tracking the changes here keeps the render cache correct without
+    # touching any of those call sites.
+    def __init__(self, items=None, on_change=None):
+        super().__init__(items or {})
+        self.on_change = on_change
+
+    def _changed(self, tile):
+        if self.on_change is not None:
+            self.on_change(tile)
+
+    def __setitem__(self, tile, symbol):
+        if self.get(tile) == symbol and tile in self:
+            return
+        super().__setitem__(tile, symbol)
+        self._changed(tile)
+
+    def __delitem__(self, tile):
+        super().__delitem__(tile)
+        self._changed(tile)
+
+    def pop(self, tile, *default):
+        had = tile in self
+        value = super().pop(tile, *default)
+        if had:
+            self._changed(tile)
+        return value
+
+    def popitem(self):
+        tile, symbol = super().popitem()
+        self._changed(tile)
+        return tile, symbol
+
+    def setdefault(self, tile, symbol=None):
+        if tile not in self:
+            self[tile] = symbol
+        return self[tile]
+
+    def update(self, *args, **kwargs):
+        for tile, symbol in dict(*args, **kwargs).items():
+            self[tile] = symbol
+
+    def clear(self):
+        tiles = list(self.keys())
+        super().clear()
+        for tile in tiles:
+            self._changed(tile)
 
 
 class WorldMap:
+    # search_mode="auto" switches to Jump Point Search when at least this much of the
+    # (inflated) map is walkable: JPS pays off on wide open ground, not in mazes.
+    JPS_OPEN_FRACTION = 0.85
+    # ...and to hierarchical search (hpa.py) on other maps with at least this many tiles,
+    # where a flat search runs out of nodes before it reaches far goals.
+    HPA_MIN_TILES = 128 * 128
+
     def __init__(
         self,
         rows: list[str],
@@ -11,19 +73,63 @@ class WorldMap:
         solid_tiles: set[str],
         inflate_margin: int = 1,
         objects: dict[tuple[int, int], str] | None = None,
+        chunk_tiles: int = 16,
+        search_mode: str = "auto",
+        max_chunks: int = 24,
     ):
         self.rows = rows
         self.tile_size = tile_size
         self.solid_tiles = solid_tiles
-        self.objects = objects or {}
 
         self.h = len(rows)
         self.w = len(rows[0]) if self.h > 0 else 0
 
+        # Render cache: terrain + objects pre-rendered into chunk_tiles x chunk_tiles surfaces.
+        # A chunk is only re-rendered after a tile or object inside it changes, or after it
+        # was evicted: only the max_chunks most recently drawn are kept (a 16x16-tile chunk
+        # at 48 px is ~2.4 MB; a screen shows up to 9), least recently drawn first out.
+        self.chunk_tiles = max(1, chunk_tiles)
+        self.max_chunks = max(1, max_chunks)
+        self._chunks: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self._dirty_chunks: set[tuple[int, int]] = set()
+        self._chunk_sources = None
+
+        # Tiles changed since the last take_changed_tiles() call (None = everything changed).
+        self._changed_tiles: set[tuple[int, int]] | None = None
+
+        # Bumped by rebuild_blocked(), so cached paths (self.path_cache), flow fields and
+        # the path workers' grid know when they're stale. Tile and object writes that don't
+        # change what blocks (coins, potions) leave it alone.
+        self.blocked_version = 0
+        self.path_cache = PathCache()
+        self.blocked_grid: BlockedGrid | None = None
+
+        # Path search used by find_path(): "astar", "jps" (Jump Point Search), "hpa"
+        # (hierarchical, returns the path up to the next cluster), or "auto" to pick by the
+        # map's size and openness (see JPS_OPEN_FRACTION / HPA_MIN_TILES).
+        # A* and JPS return equally short paths. HPA*'s are usually within ~10% of the
+        # shortest (about 1% longer at the median on a 150x150 maze), occasionally much longer.
+        self.search_mode = search_mode
+        self.uses_jps = False
+        self.uses_hpa = False
+        self.hpa: HierarchicalPathfinder | None = None
+
+        self.objects = objects or {}
+
         self.inflate_margin = inflate_margin
         self.blocking_objects = {"h", "t", "|", "c", "C"}
         self.rebuild_blocked()
 
+    @property
+    def objects(self) -> ObjectLayer:
+        return self._objects
+
+    @objects.setter
+    def objects(self, value: dict[tuple[int, int], str]):
+        # Replacing the whole layer (e.g. restoring the saved house objects) invalidates every chunk.
+        self._objects = ObjectLayer(value, on_change=self._on_tile_changed)
+        self.invalidate_chunks()
+
     def rebuild_blocked(self):
         base_blocked = set()
         for ty in range(self.h):
@@ -38,6 +144,40 @@ class WorldMap:
 
         self.inflated_blocked = inflate_blocked(base_blocked, self.w, self.h, margin=self.inflate_margin)
 
+        # Same tiles as a flat bitmap for the array-based A* (its search buffers are kept
+        # across rebuilds), grown from the base tiles on the bitmap itself.
+        if self.blocked_grid is None:
+            self.blocked_grid = BlockedGrid(self.w, self.h)
+        # HPA* re-links only the clusters that changed, so it needs the previous bitmap.
+        old_cells = bytes(self.blocked_grid.cells) if self.hpa is not None else None
+        self.blocked_grid.reset(base_blocked, margin=self.inflate_margin)
+        self.blocked_version += 1
+
+        if self.search_mode == "auto":
+            self.uses_jps = self.blocked_grid.open_fraction() >= self.JPS_OPEN_FRACTION
+            self.uses_hpa = not self.uses_jps and self.w * self.h >= self.HPA_MIN_TILES
+        else:
+            self.uses_jps = self.search_mode == "jps"
+            self.uses_hpa = self.search_mode == "hpa"
+
+        if not self.uses_hpa:
+            self.hpa = None
+        elif old_cells is None:
+            self.hpa = HierarchicalPathfinder(self.blocked_grid)
+        else:
+            # Only the clusters around tiles that changed (e.g. a placed or removed object) are re-linked.
+            self.hpa.update_cells(self._changed_cells(old_cells, self.blocked_grid.cells))
+
+    def _changed_cells(self, old: bytes, new: bytearray):
+        # Indices where two blocked bitmaps differ; whole columns are compared first.
+        h = self.h
+        changed = []
+        for x in range(self.w):
+            lo = x * h
+            if old[lo : lo + h] != new[lo : lo + h]:
+                changed.extend(i for i in range(lo, lo + h) if old[i] != new[i])
+        return changed
+
     @property
     def pixel_width(self):
         return self.w * self.tile_size
@@ -49,6 +189,29 @@ class WorldMap:
     def is_blocked_tile(self, tx: int, ty: int):
         return (tx, ty) in self.inflated_blocked
 
+    def set_tile(self, tx: int, ty: int, symbol: str):
+        """Change one terrain tile. Call rebuild_blocked() afterwards if solidity changed."""
+        row = self.rows[ty]
+        if row[tx] == symbol:
+            return
+        self.rows[ty] = row[:tx] + symbol + row[tx + 1 :]
+        self._on_tile_changed((tx, ty))
+
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int]):
+        """A* from start to goal (excluding start) over the inflated blocked set, cached.
+
+        With HPA* the path may end part-way, at the next cluster; ask again from there.
+        """
+        if self.uses_hpa:
+            search = self.hpa.find_path
+        elif self.uses_jps:
+            search = self.blocked_grid.jps
+        else:
+            search = None
+        return self.path_cache.find_path(
+            start, goal, self.blocked_grid, self.w, self.h, self.blocked_version, search=search
+        )
+
     def colliders_for_rect(self, r: pygame.Rect):
         left = max(0, r.left // self.tile_size)
         right = min(self.w - 1, (r.right - 1) // self.tile_size)
@@ -67,23 +230,57 @@ class WorldMap:
                     colliders.append(pygame.Rect(tx * self.tile_size, ty * self.tile_size, self.tile_size, self.tile_size))
         return colliders
 
-    def draw(self, screen: pygame.Surface, camera_offset: pygame.Vector2, tileset, object_registry=None):
-        screen_w = screen.get_width()
-        screen_h = screen.get_height()
+    # ------------------------------------------------------------------
+    # chunk render cache
+    # ------------------------------------------------------------------
+    def _on_tile_changed(self, tile: tuple[int, int]):
+        if self._changed_tiles is not None:
+            self._changed_tiles.add(tile)
+
+        tx, ty = tile
+        key = (tx // self.chunk_tiles, ty // self.chunk_tiles)
+        if key in self._chunks:
+            self._dirty_chunks.add(key)
+
+    def invalidate_chunks(self):
+        self._chunks.clear()
+        self._dirty_chunks.clear()
+        self._changed_tiles = None
 
-        start_tx = max(0, int(camera_offset.x) // self.tile_size)
-        end_tx = min(self.w - 1, (int(camera_offset.x) + screen_w) // self.tile_size + 1)
-        start_ty = max(0, int(camera_offset.y) // self.tile_size)
-        end_ty = min(self.h - 1, (int(camera_offset.y) + screen_h) // self.tile_size + 1)
+    def take_changed_tiles(self):
+        """Return the tiles whose rendering changed since the last call.
 
-        for ty in range(start_ty, end_ty + 1):
+        Returns None when the whole map must be considered changed.
+        """
+        changed = self._changed_tiles
+        self._changed_tiles = set()
+        return changed
+
+    def _render_chunk(self, cx: int, cy: int, tileset, object_registry):
+        ts = self.tile_size
+        start_tx = cx * self.chunk_tiles
+        start_ty = cy * self.chunk_tiles
+        end_tx = min(self.w, start_tx + self.chunk_tiles)
+        end_ty = min(self.h, start_ty + self.chunk_tiles)
+
+        size = ((end_tx - start_tx) * ts, (end_ty - start_ty) * ts)
+        surf = self._chunks.get((cx, cy))
+        if surf is None and len(self._chunks) >= self.max_chunks:
+            # Evict the least recently drawn chunk, and reuse its surface if it fits.
+            old_key, old_surf = self._chunks.popitem(last=False)
+            self._dirty_chunks.discard(old_key)
+            if old_surf.get_size() == size:
+                surf = old_surf
+        if surf is None:
+            surf = pygame.Surface(size)
+        surf.fill((0, 0, 0))
+
+        for ty in range(start_ty, end_ty):
             row = self.rows[ty]
-            for tx in range(start_tx, end_tx + 1):
-                ch = row[tx]
-                img = tileset.image_for(ch)
-                x = tx * self.tile_size - int(camera_offset.x)
-                y = ty * self.tile_size - int(camera_offset.y)
-                screen.blit(img, (x, y))
+            y = (ty - start_ty) * ts
+            for tx in range(start_tx, end_tx):
+                x = (tx - start_tx) * ts
+                surf.blit(tileset.image_for(row[tx]), (x, y))
 
                 obj = self.objects.get((tx, ty))
                 if obj is not None:
@@ -92,4 +289,42 @@ class WorldMap:
                         obj_img = object_registry.image_for(obj)
                     if obj_img is None:
                         obj_img = tileset.image_for(obj)
-                    screen.blit(obj_img, (x, y))
\ No newline at end of file
+                    surf.blit(obj_img, (x, y))
+
+        self._chunks[(cx, cy)] = surf
+        self._dirty_chunks.discard((cx, cy))
+        return surf
+
+    def _chunk_for(self, cx: int, cy: int, tileset, object_registry):
+        surf = self._chunks.get((cx, cy))
+        if surf is None or (cx, cy) in self._dirty_chunks:
+            surf = self._render_chunk(cx, cy, tileset, object_registry)
+        self._chunks.move_to_end((cx, cy))
+        return surf
+
+    def draw(self, screen: pygame.Surface, camera_offset: pygame.Vector2, tileset, object_registry=None, area=None):
+        # `area`: only blit the chunks under this screen rect (default: the whole screen).
+        if self.w == 0 or self.h == 0:
+            return
+
+        # Chunks are rendered with a specific tileset/registry; drop them if those change.
+        sources = (id(tileset), id(object_registry))
+        if sources != self._chunk_sources:
+            self.invalidate_chunks()
+            self._chunk_sources = sources
+
+        ox = int(camera_offset.x)
+        oy = int(camera_offset.y)
+        chunk_px = self.chunk_tiles * self.tile_size
+
+        if area is None:
+            area = screen.get_rect()
+        start_cx = max(0, (ox + area.left) // chunk_px)
+        end_cx = min((self.w - 1) // self.chunk_tiles, (ox + area.right - 1) // chunk_px)
+        start_cy = max(0, (oy + area.top) // chunk_px)
+        end_cy = min((self.h - 1) // self.chunk_tiles, (oy + area.bottom - 1) // chunk_px)
+
+        for cy in range(start_cy, end_cy + 1):
+            for cx in range(start_cx, end_cx + 1):
+                surf = self._chunk_for(cx, cy, tileset, object_registry)
+                screen.blit(surf, (cx * chunk_px - ox, cy * chunk_px - oy))